@@ -8,16 +8,41 @@ Responsibilities:
 - Surface actionable authentication errors
 """
 
-from typing import Optional
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
 
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
 
+from app.calendar.http_session import get_client
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# Env refresh-token credentials shared by every GoogleAuth instance, keyed by
+# (client_id, refresh_token).
+_token_cache: Dict[Tuple[str, str], Credentials] = {}
+
+# In-flight refreshes under the same key. Concurrent callers await the one
+# task instead of each hitting the token endpoint (single-flight).
+_refresh_tasks: Dict[Tuple[str, str], "asyncio.Task[Credentials]"] = {}
+
+# Refresh a little before Google's expiry so in-flight calls never race it
+TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+
+
+def _is_fresh(creds: Credentials) -> bool:
+    """True if creds has a token that stays valid past the refresh margin."""
+    if not creds.token:
+        return False
+    if creds.expiry is None:
+        return creds.valid
+    # google-auth stores expiry as naive UTC
+    return creds.expiry - datetime.utcnow() > TOKEN_REFRESH_MARGIN
+
 
 class GoogleAuthError(Exception):
     """
@@ -36,7 +61,7 @@ class GoogleAuth:
 
     Usage:
         auth = GoogleAuth()
-        creds = auth.get_credentials()
+        creds = await auth.get_credentials()
     """
 
     def __init__(self, access_token: Optional[str] = None) -> None:
@@ -65,10 +90,12 @@ class GoogleAuth:
 
     # Internal helpers ------------------------------------------------------------------
 
-    def _refresh_credentials(self) -> None:
+    async def _refresh_credentials(self) -> None:
         """
         Refresh the access token using the stored refresh token.
 
+        Posts the refresh grant over the shared HTTP client, so the
+        round-trip never blocks the event loop or a worker thread.
         This method mutates self._creds.
         """
         if not all([self.client_id, self.client_secret, self.refresh_token]):
@@ -79,17 +106,38 @@ class GoogleAuth:
 
         logger.info("Refreshing Google Calendar access token")
 
-        self._creds = Credentials(
-            token=None,
-            refresh_token=self.refresh_token,
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            token_uri="https://oauth2.googleapis.com/token",
-            scopes=self.scopes,
-        )
-
         try:
-            self._creds.refresh(Request())
+            resp = await get_client().post(
+                TOKEN_URI,
+                data={
+                    "grant_type": "refresh_token",
+                    "refresh_token": self.refresh_token,
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "scope": " ".join(self.scopes),
+                },
+            )
+            payload = resp.json()
+
+            if resp.status_code != 200:
+                logger.error(
+                    "Google token endpoint returned %s: %s",
+                    resp.status_code,
+                    payload.get("error_description") or payload.get("error"),
+                )
+                raise GoogleAuthError("Google rejected the refresh token")
+
+            self._creds = Credentials(
+                token=payload.get("access_token"),
+                refresh_token=self.refresh_token,
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                token_uri=TOKEN_URI,
+                scopes=self.scopes,
+                # google-auth expects naive UTC
+                expiry=datetime.utcnow()
+                + timedelta(seconds=int(payload.get("expires_in", 0))),
+            )
 
             if not self._creds.valid or not self._creds.token:
                 logger.error("Google returned invalid credentials after refresh")
@@ -140,44 +188,60 @@ class GoogleAuth:
                 "Failed to create credentials from user access token"
             ) from e
 
+    async def _refresh_shared(self, key: Tuple[str, str]) -> Credentials:
+        """
+        Refresh once on behalf of every caller waiting on key.
+        """
+        try:
+            await self._refresh_credentials()
+            _token_cache[key] = self._creds
+            return self._creds
+        finally:
+            _refresh_tasks.pop(key, None)
+
     # Public API ------------------------------------------------------------------
-    def get_credentials(self) -> Credentials:
+    async def get_credentials(self) -> Credentials:
         """
         Return valid Google OAuth credentials.
 
         If a user access token was provided, uses that.
         Otherwise, falls back to refresh token from environment variables.
         """
-        if self._creds is None:
-            # Decide which authentication method to use
-            if self.user_access_token:
+        if self.user_access_token:
+            if self._creds is None:
                 logger.debug("No cached credentials; using user-provided access token")
                 self._create_credentials_from_token()
-            else:
-                logger.debug(
-                    "No cached credentials; using refresh token from environment"
-                )
-                self._refresh_credentials()
 
-        elif not self._creds.valid:
-
-            if self.user_access_token:
+            elif not self._creds.valid:
                 # User tokens cannot be refreshed - they must get a new one from frontend
                 logger.warning("User-provided token expired; re-creating credentials")
                 self._create_credentials_from_token()
+
+            return self._creds
+
+        key = (self.client_id, self.refresh_token)
+        creds = _token_cache.get(key)
+
+        if creds is None or not _is_fresh(creds):
+            task = _refresh_tasks.get(key)
+            if task is None:
+                logger.debug("No fresh cached credentials; refreshing from environment")
+                task = asyncio.create_task(self._refresh_shared(key))
+                _refresh_tasks[key] = task
             else:
-                logger.warning(
-                    "Cached credentials expired; refreshing from environment"
-                )
-                self._refresh_credentials()
+                logger.debug("Token refresh already in flight; waiting for it")
+
+            # Shield so one caller's cancellation doesn't abort everyone's refresh
+            creds = await asyncio.shield(task)
 
+        self._creds = creds
         return self._creds
 
-    def get_access_token(self) -> str:
+    async def get_access_token(self) -> str:
         """
         Return a valid Google OAuth access token string.
         """
-        creds = self.get_credentials()
+        creds = await self.get_credentials()
 
         if not creds.token:
             logger.error("Access token missing after credential refresh")
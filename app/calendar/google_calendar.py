@@ -3,31 +3,76 @@ Google Calendar Event Creation Service
 
 Responsibilities:
 - Create calendar events using Google Calendar API
+- Batch several inserts into one multipart request
 - Handle retries and transient failures
 - Surface clear, domain-specific errors
 """
 
+import json
 import logging
 import asyncio
+import random
+import re
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import httpx
 
 from app.calendar.google_auth import GoogleAuth, GoogleAuthError
+from app.calendar.http_session import get_client
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+EVENTS_URL = "https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events"
+BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+
+# Google accepts at most 50 calls per batch request
+BATCH_LIMIT = 50
+_CONTENT_ID_RE = re.compile(r"Content-ID:\s*<response-item(\d+)>", re.I)
+_STATUS_LINE_RE = re.compile(r"^HTTP/[\d.]+\s+(\d{3})", re.M)
+
+# Rate limits and server-side failures are worth retrying; other 4xx are not.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+# Tolerate small clock skew / slow confirmations before rejecting as "past"
+PAST_START_GRACE = timedelta(minutes=5)
+
+
+def _new_event_id() -> str:
+    """Client-side event id; hex digits are valid base32hex, as the API requires."""
+    return uuid.uuid4().hex
+
 
 class GoogleCalendarError(Exception):
     """
     Raised when calendar event creation fails.
+
+    status carries the HTTP status code when the failure came from the API.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class GoogleCalendarPartialError(GoogleCalendarError):
+    """
+    Raised by batch_create_events when only some events were created.
+
+    created holds the results for the events that were inserted.
     """
 
-    pass
+    def __init__(
+        self, message: str, created: List[Dict[str, Any]], failed: int
+    ) -> None:
+        super().__init__(message)
+        self.created = created
+        self.failed = failed
 
 
 class GoogleCalendarService:
@@ -39,10 +84,11 @@ class GoogleCalendarService:
         event = await calendar.create_event(...)
     """
 
-    _executor = ThreadPoolExecutor(max_workers=2)
-
     def __init__(self):
         self.calendar_id = settings.GOOGLE_CALENDAR_ID
+        self._events_url = EVENTS_URL.format(
+            calendar_id=quote(self.calendar_id, safe="")
+        )
 
     # Public async API -----------------------------------------------------------------
 
@@ -56,6 +102,7 @@ class GoogleCalendarService:
         timezone: str = "Asia/Kolkata",
         retries: int = 2,
         access_token: Optional[str] = None,
+        event_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Create a Google Calendar event.
@@ -64,113 +111,383 @@ class GoogleCalendarService:
             access_token: Optional user's Google OAuth access token. If provided,
                          creates the event in that user's calendar instead of using
                          environment variables.
+            event_id: Optional client-generated id. Makes retries idempotent:
+                     a resend of an already created event gets 409 and is
+                     reported as created.
 
         Returns:
             Dict containing event_id, html_link, status
         """
+        self.validate_event(title, start_datetime)
+
+        return await self._with_retries(
+            lambda: self._insert_event(
+                title,
+                start_datetime,
+                duration_minutes,
+                description,
+                timezone,
+                access_token,
+                event_id,
+            ),
+            retries,
+            "Failed to create calendar event after retries",
+        )
+
+    async def batch_create_events(
+        self,
+        events: List[Dict[str, Any]],
+        *,
+        timezone: str = "Asia/Kolkata",
+        retries: int = 2,
+        access_token: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create several events with one multipart request per BATCH_LIMIT.
+
+        Each entry holds create_event's event arguments (title, start_datetime,
+        duration_minutes, description). Each event gets a client-generated
+        id, so resending the batch after a timeout cannot insert duplicates.
+        Events that fail validation are skipped and parts that fail with a
+        retryable status are retried one by one through create_event.
+
+        Raises:
+            GoogleCalendarPartialError: some events were created and some
+                were not; carries the created results
+            GoogleCalendarError: no event was created
+
+        Returns:
+            One dict (event_id, html_link, status) per event, in input order
+        """
+        valid: List[Dict[str, Any]] = []
+        failed = 0
+        for event in events:
+            try:
+                self.validate_event(event["title"], event["start_datetime"])
+            except GoogleCalendarError as e:
+                # One bad event must not cost the rest of the batch
+                logger.error(
+                    "Skipping invalid calendar event %r: %s", event["title"], e
+                )
+                failed += 1
+                continue
+            event_id = event.get("event_id") or _new_event_id()
+            valid.append({**event, "event_id": event_id})
+
+        results: List[Dict[str, Any]] = []
+
+        # A single event gains nothing from the multipart envelope
+        if len(valid) == 1:
+            try:
+                results.append(
+                    await self.create_event(
+                        **valid[0],
+                        timezone=timezone,
+                        retries=retries,
+                        access_token=access_token,
+                    )
+                )
+            except GoogleCalendarError:
+                logger.exception("Calendar insert failed: %s", valid[0]["title"])
+                failed += 1
+            valid = []
+
+        token = await self._get_token(access_token) if valid else ""
+
+        for offset in range(0, len(valid), BATCH_LIMIT):
+            chunk = valid[offset : offset + BATCH_LIMIT]
+            try:
+                outcomes = await self._with_retries(
+                    lambda: self._post_batch(chunk, timezone, token),
+                    retries,
+                    "Failed to send calendar batch after retries",
+                )
+            except GoogleCalendarError:
+                # Keep what earlier chunks created
+                logger.exception("Calendar batch of %s events failed", len(chunk))
+                failed += len(chunk)
+                continue
+
+            for event, (status, body) in zip(chunk, outcomes):
+                if status < 400:
+                    results.append(self._event_result(body))
+                    continue
+
+                if status == 409:
+                    # Inserted by an earlier attempt of this batch
+                    results.append(self._existing_result(event["event_id"]))
+                    continue
+
+                if status in RETRYABLE_STATUSES:
+                    try:
+                        results.append(
+                            await self.create_event(
+                                **event,
+                                timezone=timezone,
+                                retries=retries,
+                                access_token=access_token,
+                            )
+                        )
+                        continue
+                    except GoogleCalendarError:
+                        pass
+
+                logger.error(
+                    "Batched calendar insert failed (status=%s): %s",
+                    status,
+                    event["title"],
+                )
+                failed += 1
+
+        logger.info(
+            "Calendar batch finished: %s created, %s failed", len(results), failed
+        )
+        if failed:
+            message = f"{failed} of {len(events)} batched calendar events failed"
+            if results:
+                raise GoogleCalendarPartialError(message, results, failed)
+            raise GoogleCalendarError(message)
+        return results
+
+    def validate_event(self, title: str, start_datetime: datetime) -> None:
+        """Reject input that would fail identically on every attempt."""
         if not title:
             raise GoogleCalendarError("Event title is required")
 
         if not isinstance(start_datetime, datetime):
             raise GoogleCalendarError("start_datetime must be a datetime object")
 
-        loop = asyncio.get_running_loop()
+        if start_datetime < datetime.now(start_datetime.tzinfo) - PAST_START_GRACE:
+            raise GoogleCalendarError("start_datetime is in the past")
+
+        if not self.calendar_id:
+            raise GoogleCalendarError("No calendar id configured")
 
+    # Internal async implementation ------------------------------------------------------------
+
+    async def _with_retries(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        retries: int,
+        failure_message: str,
+    ) -> Any:
+        """Retry transient API/transport failures with jittered backoff."""
         for attempt in range(1, retries + 1):
             try:
-                return await loop.run_in_executor(
-                    self._executor,
-                    self._create_event_blocking,
-                    title,
-                    start_datetime,
-                    duration_minutes,
-                    description,
-                    timezone,
-                    access_token,
+                return await call()
+
+            except GoogleCalendarError as e:
+                if e.status not in RETRYABLE_STATUSES:
+                    raise
+                logger.warning(
+                    "Calendar API returned transient status %s (attempt %s)",
+                    e.status,
+                    attempt,
                 )
 
-            except GoogleCalendarError:
-                raise  
+            except Exception:
+                logger.exception("Calendar request failed (attempt %s)", attempt)
 
-            except Exception as e:
-                logger.exception("Calendar event creation failed (attempt %s)", attempt)
+            if attempt < retries:
+                # Truncated exponential backoff with full jitter
+                delay = min(
+                    MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                )
+                await asyncio.sleep(random.uniform(0, delay))
 
-        raise GoogleCalendarError("Failed to create calendar event after retries")
+        raise GoogleCalendarError(failure_message)
 
-    # Internal blocking implementation ------------------------------------------------------------
+    async def _get_token(self, access_token: Optional[str]) -> str:
+        try:
+            # Pass the access_token to GoogleAuth
+            auth = GoogleAuth(access_token=access_token)
+            return await auth.get_access_token()
+        except GoogleAuthError as e:
+            logger.error("Google auth failed: %s", e)
+            raise GoogleCalendarError("Authentication with Google failed") from e
 
-    def _create_event_blocking(
-        self,
+    @staticmethod
+    def _event_body(
         title: str,
         start_datetime: datetime,
         duration_minutes: int,
         description: Optional[str],
         timezone: str,
-        access_token: Optional[str],
+        event_id: Optional[str] = None,
     ) -> Dict[str, Any]:
+        start_iso = start_datetime.isoformat()
+        end_iso = (start_datetime + timedelta(minutes=duration_minutes)).isoformat()
+
+        event_body = {
+            "summary": title,
+            "start": {"dateTime": start_iso, "timeZone": timezone},
+            "end": {"dateTime": end_iso, "timeZone": timezone},
+        }
+        if description:
+            event_body["description"] = description
+        if event_id:
+            event_body["id"] = event_id
+        return event_body
+
+    @staticmethod
+    def _event_result(event: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "event_id": event.get("id"),
+            "html_link": event.get("htmlLink"),
+            "status": event.get("status"),
+        }
+
+    @staticmethod
+    def _existing_result(event_id: str) -> Dict[str, Any]:
+        """Result for an event a previous attempt already created (409)."""
+        return {"event_id": event_id, "html_link": None, "status": "confirmed"}
+
+    async def _post_batch(
+        self,
+        chunk: List[Dict[str, Any]],
+        timezone: str,
+        token: str,
+    ) -> List[Tuple[int, Dict[str, Any]]]:
         """
-        Blocking Google Calendar API call.
+        Send one multipart/mixed batch and return (status, body) per part.
+
+        The outer Authorization header applies to every inner request.
+        Parts missing from the response are reported as 503 so the caller
+        retries them individually.
         """
+        boundary = f"batch_{uuid.uuid4().hex}"
+        path = urlsplit(self._events_url).path
+
+        parts = []
+        for index, event in enumerate(chunk):
+            body = self._event_body(
+                event["title"],
+                event["start_datetime"],
+                event.get("duration_minutes", 30),
+                event.get("description"),
+                timezone,
+                event.get("event_id"),
+            )
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item{index}>\r\n\r\n"
+                f"POST {path}\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{json.dumps(body)}\r\n"
+            )
+        payload = "".join(parts) + f"--{boundary}--\r\n"
+
+        logger.info("Sending calendar batch of %s events", len(chunk))
+
         try:
-            # Pass the access_token to GoogleAuth
-            auth = GoogleAuth(access_token=access_token)
-            creds = auth.get_credentials()
-        except GoogleAuthError as e:
-            logger.error("Google auth failed: %s", e)
-            raise GoogleCalendarError("Authentication with Google failed") from e
+            resp = await get_client().post(
+                BATCH_URL,
+                content=payload.encode(),
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": f"multipart/mixed; boundary={boundary}",
+                },
+            )
+        except httpx.TransportError:
+            raise
+        except Exception as e:
+            logger.exception("Unexpected calendar batch error")
+            raise GoogleCalendarError("Unexpected error while sending batch") from e
+
+        if resp.status_code >= 400:
+            logger.error(
+                "Google Calendar batch error (status=%s): %s",
+                resp.status_code,
+                resp.text,
+            )
+            raise GoogleCalendarError(
+                f"Google Calendar batch error: {resp.status_code}",
+                status=resp.status_code,
+            )
 
-        end_datetime = start_datetime + timedelta(minutes=duration_minutes)
+        outcomes: List[Tuple[int, Dict[str, Any]]] = [(503, {})] * len(chunk)
+        content_type = resp.headers.get("content-type", "")
+        resp_boundary = content_type.partition("boundary=")[2].strip('"')
+        for part in resp.text.split(f"--{resp_boundary}"):
+            id_match = _CONTENT_ID_RE.search(part)
+            status_match = _STATUS_LINE_RE.search(part)
+            if not id_match or not status_match:
+                continue
+            index = int(id_match.group(1))
+            if index >= len(chunk):
+                continue
+
+            start, end = part.find("{"), part.rfind("}")
+            try:
+                body = json.loads(part[start : end + 1]) if start != -1 else {}
+            except ValueError:
+                body = {}
+            outcomes[index] = (int(status_match.group(1)), body)
 
-        event_body = {
-            "summary": title,
-            "description": description or "",
-            "start": {
-                "dateTime": start_datetime.isoformat(),
-                "timeZone": timezone,
-            },
-            "end": {
-                "dateTime": end_datetime.isoformat(),
-                "timeZone": timezone,
-            },
-        }
+        return outcomes
+
+    async def _insert_event(
+        self,
+        title: str,
+        start_datetime: datetime,
+        duration_minutes: int,
+        description: Optional[str],
+        timezone: str,
+        access_token: Optional[str],
+        event_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        POST the event straight to the Calendar v3 REST endpoint.
+
+        Transport failures (connection errors, timeouts) propagate unchanged so
+        create_event can retry them; everything else becomes GoogleCalendarError.
+        """
+        token = await self._get_token(access_token)
+        event_body = self._event_body(
+            title, start_datetime, duration_minutes, description, timezone, event_id
+        )
 
         logger.info(
             "Creating calendar event: title=%s start=%s",
             title,
-            start_datetime.isoformat(),
+            event_body["start"]["dateTime"],
         )
 
         try:
-            service = build(
-                "calendar",
-                "v3",
-                credentials=creds,
-                cache_discovery=False,
+            resp = await get_client().post(
+                self._events_url,
+                json=event_body,
+                headers={"Authorization": f"Bearer {token}"},
             )
 
-            event = (
-                service.events()
-                .insert(
-                    calendarId=self.calendar_id,
-                    body=event_body,
+            if resp.status_code == 409 and event_id:
+                # A retried insert that had already gone through
+                logger.info("Calendar event already exists (event_id=%s)", event_id)
+                return self._existing_result(event_id)
+
+            if resp.status_code >= 400:
+                logger.error(
+                    "Google Calendar API error (status=%s): %s",
+                    resp.status_code,
+                    resp.text,
                 )
-                .execute()
-            )
+                raise GoogleCalendarError(
+                    f"Google Calendar API error: {resp.status_code} {resp.text}",
+                    status=resp.status_code,
+                )
+
+            event = resp.json()
 
             logger.info(
                 "Calendar event created successfully (event_id=%s)",
                 event.get("id"),
             )
 
-            return {
-                "event_id": event.get("id"),
-                "html_link": event.get("htmlLink"),
-                "status": event.get("status"),
-            }
+            return self._event_result(event)
 
-        except HttpError as e:
-            logger.exception("Google Calendar API error")
-            raise GoogleCalendarError(f"Google Calendar API error: {e}") from e
+        except (GoogleCalendarError, httpx.TransportError):
+            raise
 
         except Exception as e:
             logger.exception("Unexpected calendar error")
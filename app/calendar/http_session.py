@@ -0,0 +1,41 @@
+"""
+Shared HTTP client for Google API calls
+
+Responsibilities:
+- Own one HTTP/2 connection pool for OAuth and Calendar requests
+- Create it lazily inside the running event loop
+- Close it on application shutdown
+"""
+
+from typing import Optional
+
+import httpx
+
+REQUEST_TIMEOUT = 10.0
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it on first use.
+
+    HTTP/2 lets concurrent requests to googleapis.com multiplex over one
+    connection, and HPACK shrinks the repeated Authorization headers.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_connections=20),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client. Called on application shutdown."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
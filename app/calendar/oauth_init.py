@@ -2,19 +2,11 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from pathlib import Path
 
 
-BASE_DIR = Path(__file__).resolve().parents[2]
-
 SCOPES = ["https://www.googleapis.com/auth/calendar.events"]
 
 
 flow = InstalledAppFlow.from_client_secrets_file(
-    BASE_DIR / "client_secret.json",
-    SCOPES,
-)
-
-
-flow = InstalledAppFlow.from_client_secrets_file(
-    "client_secret.json",
+    Path(__file__).parent.parent.parent / "client_secret.json",
     SCOPES,
 )
 
@@ -0,0 +1,19 @@
+"""
+Shared worker pools for blocking model inference
+
+Responsibilities:
+- Bound how many STT / TTS inferences run at once, process-wide
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+
+# Per-inference native thread counts are split by pool size where each model
+# loads: Whisper's cpu_threads and torch.set_num_threads for Kokoro.
+stt_pool = ThreadPoolExecutor(
+    max_workers=settings.STT_CONCURRENCY, thread_name_prefix="stt"
+)
+tts_pool = ThreadPoolExecutor(
+    max_workers=settings.TTS_CONCURRENCY, thread_name_prefix="tts"
+)
@@ -1,9 +1,17 @@
 import os
+from functools import lru_cache
+
 from pydantic import Field
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True,
+    )
+
     # Environment ----------------
     ENV: str = Field(default="development", env="ENV")
 
@@ -23,11 +31,13 @@ class Settings(BaseSettings):
     WHISPER_LANGUAGE: str = Field(default="en", env="WHISPER_LANGUAGE")
     WHISPER_COMPUTE_TYPE: str = Field(default="int8", env="WHISPER_COMPUTE_TYPE")
     STT_SAMPLE_RATE: int = Field(default=16000, env="STT_SAMPLE_RATE")
+    STT_CONCURRENCY: int = Field(default=2, env="STT_CONCURRENCY")
 
     # TTS ----------------------------
     TTS_PROVIDER: str = Field(default="kokoro", env="TTS_PROVIDER")
     TTS_VOICE: str = Field(default="af_heart", env="TTS_VOICE")
     TTS_SAMPLE_RATE: int = Field(default=24000, env="TTS_SAMPLE_RATE")
+    TTS_CONCURRENCY: int = Field(default=2, env="TTS_CONCURRENCY")
 
     # Calendar ------------------------
     GOOGLE_CLIENT_ID: str = Field(default="", env="GOOGLE_CLIENT_ID")
@@ -40,13 +50,19 @@ class Settings(BaseSettings):
     APP_PORT: int = Field(default=8000, env="APP_PORT")
     DEBUG: bool = Field(default=True, env="DEBUG")
 
+    # Sessions ------------------------
+    MAX_SESSIONS: int = Field(default=10_000, env="MAX_SESSIONS")
+    SESSION_TTL_SECONDS: int = Field(default=3600, env="SESSION_TTL_SECONDS")
+
     # Logging ------------------------
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
     LOG_FILE_PATH: str = Field(default="app.log", env="LOG_FILE_PATH")
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read .env and validate once per process."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
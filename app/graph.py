@@ -1,48 +1,300 @@
-from langgraph.graph import StateGraph, END
+import asyncio
+import hashlib
 import logging
+import re
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
 
 from app.state import ConversationState
 from app.nlu.extractor import extract_fields
-from app.nlu.generator import generate_response
-from app.calendar.google_calendar import GoogleCalendarService, GoogleCalendarError
+from app.nlu.generator import FALLBACK_RESPONSE, generate_response
+from app.nlu.intent_rules import classify_confirmation
+from app.nlu.validators import validate_name, validate_meeting_datetime
+from app.utils.datetime_parser import get_timezone, parse_datetime_fast
+from app.calendar.google_calendar import (
+    GoogleCalendarError,
+    GoogleCalendarPartialError,
+    GoogleCalendarService,
+)
 
 logger = logging.getLogger(__name__)
-calendar_service = GoogleCalendarService()
+
+
+@lru_cache(maxsize=1)
+def get_calendar_service() -> GoogleCalendarService:
+    """Build the calendar client on first use rather than at import time."""
+    return GoogleCalendarService()
+
+
+# Explicit introductions only: "my name is Sam", "I'm Jane Doe." A bare
+# capitalised reply ("Nope.", "Cool.") goes to the extractor.
+NAME_RE = re.compile(
+    r"^(?i:(my name is )|i'?m |i am )([A-Z][a-z]+(?: [A-Z][a-z]+)?)\.?$"
+)
+# "I'm X" also states how the user is; never take these as names
+_NOT_NAMES = frozenset(
+    (
+        "not just here back busy free ready done fine good great okay sorry "
+        "sure afraid available confused lost tired"
+    ).split()
+)
+
+SKIP_TITLE_REPLIES = frozenset({"no", "nope", "skip", "none", "not needed"})
+
+
+# Confirmed events are queued and inserted in one calendar batch when the
+# session wraps up, or once this many are waiting.
+MAX_PENDING_EVENTS = 5
+
+CALENDAR_ERROR_MESSAGE = (
+    "I encountered an issue connecting to the calendar. Please try again later."
+)
+CANCELLED_MESSAGE = (
+    "Okay, I've cancelled the request. Let me know if you need anything else."
+)
+CONFIRM_UNCLEAR_MESSAGE = (
+    "I'm not sure if you want to confirm. Please say yes to confirm or no to cancel."
+)
+LOOP_UNCLEAR_MESSAGE = (
+    "I didn't catch that. Do you want to schedule another event? Yes or No?"
+)
+
+# Node replies that never vary, so their audio can be rendered ahead of time
+FIXED_REPLIES = (
+    CALENDAR_ERROR_MESSAGE,
+    CANCELLED_MESSAGE,
+    CONFIRM_UNCLEAR_MESSAGE,
+    LOOP_UNCLEAR_MESSAGE,
+)
+
+
+# Opening greetings keyed by authenticated name (None for guests). A fresh
+# session's START prompt depends on nothing else, so reconnects reuse it;
+# prompt changes need a restart anyway, which clears it.
+GREETING_CACHE_SIZE = 256
+_greeting_cache: "OrderedDict[Optional[str], str]" = OrderedDict()
+
+# Slots extract_fields may fill on any call
+EXTRACTED_FIELDS = ("name", "meeting_datetime", "meeting_title", "confirmation_status")
+
+
+def _updates(state: ConversationState, *fields: str) -> dict:
+    """
+    Partial state update holding only the fields a node may have changed.
+    run_step keeps every other field as-is, so we skip a full model dump.
+    """
+    return {field: getattr(state, field) for field in fields}
+
+
+async def _extract_once(state: ConversationState) -> ConversationState:
+    """
+    Run extract_fields unless this exact message already filled slots.
+
+    Re-asking loops often get the same reply again; its extraction is already
+    applied, so a second LLM call can't change anything. The hash is only
+    recorded when extraction changed a slot, so a failed call (timeout,
+    empty output) is retried on the next identical reply.
+    """
+    msg = state.last_user_message or ""
+    digest = hashlib.blake2b(msg.encode(), digest_size=8).hexdigest()
+    if digest == state.last_extracted_hash:
+        logger.debug("Message already extracted; skipping extract_fields")
+        return state
+
+    before = [getattr(state, field) for field in EXTRACTED_FIELDS]
+    state = await extract_fields(state, state.last_user_message)
+    if [getattr(state, field) for field in EXTRACTED_FIELDS] != before:
+        state.last_extracted_hash = digest
+    return state
+
+
+async def _extract_or_retry(
+    state: ConversationState, field: str, retry: dict
+) -> tuple[ConversationState, Optional[str]]:
+    """
+    Extract while the node's retry reply is generated in parallel.
+
+    The retry goal doesn't depend on what extraction finds, so on a miss the
+    reply is already there instead of costing a second sequential LLM call.
+    Returns the retry reply only when `field` is still empty afterwards.
+    """
+    retry_task = asyncio.create_task(generate_response(state, **retry))
+    try:
+        state = await _extract_once(state)
+    except BaseException:
+        retry_task.cancel()
+        raise
+
+    if getattr(state, field):
+        retry_task.cancel()
+        return state, None
+    return state, await retry_task
+
+
+# Retry replies, shared by the speculative and the sequential path
+_NAME_RETRY = {
+    "goal": "Politely explain you didn't catch the name and ask for it again.",
+    "context_note": "User input was unclear or didn't contain a name.",
+}
+_DATETIME_RETRY = {
+    "goal": "Politely explain the date was invalid or missing, and ask for the date and time again (e.g. tomorrow at 3pm).",
+    "context_note": "Date parsing failed.",
+}
+_TITLE_RETRY = {
+    "goal": "Politely ask for the title again, or remind them they can say 'no' to skip.",
+    "context_note": "Input was not a title or 'no'.",
+}
+
+
+async def flush_pending_events(state: ConversationState) -> list:
+    """
+    Insert all queued events with one batch request and clear the queue.
+
+    The queue is emptied before the call so a failing event isn't resent on
+    every later turn; GoogleCalendarError propagates to the caller. Returns
+    the created events.
+    """
+    events, state.pending_events = state.pending_events, []
+    if not events:
+        return []
+    return await get_calendar_service().batch_create_events(
+        events, access_token=state.google_access_token
+    )
+
+
+async def _flush_outcome(state: ConversationState) -> Optional[str]:
+    """
+    Flush queued events and say how it went, as generator goal text.
+
+    None when nothing was queued. A partial failure is reported rather than
+    raised; GoogleCalendarError still propagates when nothing was created.
+    """
+    try:
+        created = await flush_pending_events(state)
+    except GoogleCalendarPartialError as e:
+        logger.exception("Calendar error")
+        return (
+            f"Tell them {len(e.created)} of their meetings were added to the "
+            f"calendar but {e.failed} could not be."
+        )
+    if not created:
+        return None
+    return "Confirm their meetings were added to the calendar."
+
+
+# Formatting ---------------------------------
+
+_WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _format_meeting_datetime(dt: datetime) -> str:
+    """
+    Same output as strftime("%A, %d %B at %I:%M %p") in the C locale,
+    assembled from the datetime fields instead of parsing a format string.
+    """
+    # Keyed on wall-clock time: aware datetimes compare equal across zones,
+    # but the spoken string must follow the event's own local fields.
+    return _format_wall_clock(dt.replace(tzinfo=None, second=0, microsecond=0))
+
+
+@lru_cache(maxsize=1024)
+def _format_wall_clock(dt: datetime) -> str:
+    hour = dt.hour % 12 or 12
+    meridiem = "PM" if dt.hour >= 12 else "AM"
+    return (
+        f"{_WEEKDAYS[dt.weekday()]}, {dt.day:02d} {_MONTHS[dt.month - 1]} "
+        f"at {hour:02d}:{dt.minute:02d} {meridiem}"
+    )
+
+
+# Fast paths ---------------------------------
+# Cheap local parsing tried before the LLM extractor. On a miss the node
+# falls back to extract_fields as usual.
+
+
+def _fast_name(message: Optional[str]) -> Optional[str]:
+    match = NAME_RE.match((message or "").strip())
+    if not match:
+        return None
+    explicit, name = match.groups()
+    if not explicit and name.split()[0].lower() in _NOT_NAMES:
+        return None
+    return validate_name(name)
+
+
+def _fast_datetime(state: ConversationState) -> Optional[datetime]:
+    # Regex fast path only: succeeds when the whole reply is a common date
+    # phrase. Free text is left to the extractor, not handed to dateparser.
+    now = datetime.now(get_timezone(state.timezone or "UTC"))
+    parsed_dt = parse_datetime_fast(state.last_user_message, now=now)
+    return validate_meeting_datetime(parsed_dt, now=now)
+
+
+async def _greeting(state: ConversationState, goal: str) -> str:
+    """START reply, from the cache when the session has no history yet."""
+    fresh = not state.chat_history
+    if fresh and state.name in _greeting_cache:
+        _greeting_cache.move_to_end(state.name)
+        return _greeting_cache[state.name]
+
+    response = await generate_response(state, goal=goal)
+    # A failed generation shouldn't stick for every later reconnect
+    if fresh and response != FALLBACK_RESPONSE:
+        _greeting_cache[state.name] = response
+        if len(_greeting_cache) > GREETING_CACHE_SIZE:
+            _greeting_cache.popitem(last=False)
+    return response
 
 
 # Nodes --------------------------------
 
 async def start_node(state: ConversationState) -> dict:
-    logger.info("[START_NODE] Executing")
+    logger.debug("[START_NODE] Executing")
 
     # Logic for authenticated users 
     if state.name:
-        logger.info("User authenticated as %s. Skipping ASK_NAME.", state.name)
-        response = await generate_response(
+        logger.debug("User authenticated as %s. Skipping ASK_NAME.", state.name)
+        response = await _greeting(
             state,
             goal=f"Greet {state.name} warmly back. Mention you are ready to schedule on their calendar. Ask for the date and time.",
         )
         state.system_message = response
         state.step = "ASK_DATETIME"
-        logger.info("Set step to ASK_DATETIME")
+        logger.debug("Set step to ASK_DATETIME")
 
     else:
         #Standard flow for guests
-        response = await generate_response(
+        response = await _greeting(
             state,
             goal="Greet the user warmly and ask for their name to start scheduling.",
         )
         state.system_message = response
         state.step = "ASK_NAME"
-        logger.info("Set step to ASK_NAME")
+        logger.debug("Set step to ASK_NAME")
 
-    return state.dict()
+    return _updates(state, "system_message", "step")
 
 
 async def ask_name_node(state: ConversationState) -> dict:
-    logger.info("Executing with last_user_message: %s", state.last_user_message)
-    state = await extract_fields(state, state.last_user_message)
-    logger.info("[ASK_NAME_NODE] After extraction, state.name: %s", state.name)
+    logger.debug(
+        "[ASK_NAME_NODE] Executing with last_user_message: %s",
+        state.last_user_message,
+    )
+    retry_response = None
+    # Slot already filled (e.g. by an earlier reply): nothing to extract
+    if not state.name:
+        fast_name = _fast_name(state.last_user_message)
+        if fast_name:
+            state.name = fast_name
+        else:
+            state, retry_response = await _extract_or_retry(state, "name", _NAME_RETRY)
+    logger.debug("[ASK_NAME_NODE] After extraction, state.name: %s", state.name)
 
     if state.name:
         response = await generate_response(
@@ -51,29 +303,35 @@ async def ask_name_node(state: ConversationState) -> dict:
         )
         state.system_message = response
         state.step = "ASK_DATETIME"
-        logger.info("Name found, moving to ASK_DATETIME")
+        logger.debug("Name found, moving to ASK_DATETIME")
     else:
         # Dynamic Retry
-        response = await generate_response(
-            state,
-            goal="Politely explain you didn't catch the name and ask for it again.",
-            context_note="User input was unclear or didn't contain a name.",
-        )
+        response = retry_response or await generate_response(state, **_NAME_RETRY)
         state.system_message = response
         state.step = "ASK_NAME"
-        logger.info("No name found, staying in ASK_NAME")
+        logger.debug("No name found, staying in ASK_NAME")
 
-    return state.dict()
+    return _updates(
+        state, "system_message", "step", "last_extracted_hash", *EXTRACTED_FIELDS
+    )
 
 
 async def ask_datetime_node(state: ConversationState) -> dict:
-    logger.info(
-        "Executing with last_user_message: %s",
+    logger.debug(
+        "[ASK_DATETIME_NODE] Executing with last_user_message: %s",
         state.last_user_message,
     )
-    state = await extract_fields(state, state.last_user_message)
-    logger.info(
-        "After extraction, meeting_datetime: %s",
+    retry_response = None
+    if not state.meeting_datetime:
+        fast_datetime = _fast_datetime(state)
+        if fast_datetime:
+            state.meeting_datetime = fast_datetime
+        else:
+            state, retry_response = await _extract_or_retry(
+                state, "meeting_datetime", _DATETIME_RETRY
+            )
+    logger.debug(
+        "[ASK_DATETIME_NODE] After extraction, meeting_datetime: %s",
         state.meeting_datetime,
     )
 
@@ -84,50 +342,51 @@ async def ask_datetime_node(state: ConversationState) -> dict:
         )
         state.system_message = response
         state.step = "ASK_TITLE"
-        logger.info("[ASK_DATETIME_NODE] DateTime found, moving to ASK_TITLE")
+        logger.debug("[ASK_DATETIME_NODE] DateTime found, moving to ASK_TITLE")
     else:
         # Dynamic Retry
-        response = await generate_response(
-            state,
-            goal="Politely explain the date was invalid or missing, and ask for the date and time again (e.g. tomorrow at 3pm).",
-            context_note="Date parsing failed.",
-        )
+        response = retry_response or await generate_response(state, **_DATETIME_RETRY)
         state.system_message = response
         state.step = "ASK_DATETIME"
-        logger.info("[ASK_DATETIME_NODE] No datetime found, staying in ASK_DATETIME")
+        logger.debug("[ASK_DATETIME_NODE] No datetime found, staying in ASK_DATETIME")
 
-    return state.dict()
+    return _updates(
+        state, "system_message", "step", "last_extracted_hash", *EXTRACTED_FIELDS
+    )
 
 
 async def ask_title_node(state: ConversationState) -> dict:
-    logger.info("[ASK_TITLE_NODE] Executing")
-    state = await extract_fields(state, state.last_user_message)
-
+    logger.debug("[ASK_TITLE_NODE] Executing")
     msg = (state.last_user_message or "").lower().strip()
 
+    retry_response = None
+    # Explicit skip or an already-known title needs no extraction
+    if not state.meeting_title and msg not in SKIP_TITLE_REPLIES:
+        state, retry_response = await _extract_or_retry(
+            state, "meeting_title", _TITLE_RETRY
+        )
+
     # If title extracted OR user explicitly says no/skip
-    if state.meeting_title or msg in {"no", "nope", "skip", "none", "not needed"}:
+    if state.meeting_title or msg in SKIP_TITLE_REPLIES:
         state.step = "CONFIRM_DETAILS"
-        logger.info("Moving to CONFIRM_DETAILS")
+        logger.debug("Moving to CONFIRM_DETAILS")
     else:
         # Dynamic Retry
-        response = await generate_response(
-            state,
-            goal="Politely ask for the title again, or remind them they can say 'no' to skip.",
-            context_note="Input was not a title or 'no'.",
-        )
+        response = retry_response or await generate_response(state, **_TITLE_RETRY)
         state.system_message = response
         state.step = "ASK_TITLE"
-        logger.info("Staying in ASK_TITLE")
+        logger.debug("Staying in ASK_TITLE")
 
-    return state.dict()
+    return _updates(
+        state, "system_message", "step", "last_extracted_hash", *EXTRACTED_FIELDS
+    )
 
 
 async def confirm_details_node(state: ConversationState) -> dict:
-    logger.info("[CONFIRM_DETAILS_NODE] Executing")
+    logger.debug("[CONFIRM_DETAILS_NODE] Executing")
 
     date_str = (
-        state.meeting_datetime.strftime("%A, %d %B at %I:%M %p")
+        _format_meeting_datetime(state.meeting_datetime)
         if state.meeting_datetime
         else "an unspecified time"
     )
@@ -146,77 +405,103 @@ async def confirm_details_node(state: ConversationState) -> dict:
     state.system_message = response
     state.step = "AWAIT_CONFIRMATION"
 
-    return state.dict()
+    return _updates(state, "system_message", "step")
 
 
 async def await_confirmation_node(state: ConversationState) -> dict:
-    logger.info(
+    logger.debug(
         "[AWAIT_CONFIRMATION_NODE] Executing with response: %s", state.last_user_message
     )
 
-    # Ensure fresh extraction for intent
-    state.confirmation_status = None
-    state = await extract_fields(state, state.last_user_message)
+    # Ensure fresh extraction for intent; rules first, LLM only if ambiguous
+    state.confirmation_status = classify_confirmation(state.last_user_message)
+    if state.confirmation_status is None:
+        state = await extract_fields(state, state.last_user_message)
 
     intent = state.confirmation_status
-    logger.info("Confirmation intent extracted: %s", intent)
+    logger.debug("Confirmation intent extracted: %s", intent)
 
     if intent == "yes":
+        event = {
+            "title": state.meeting_title or "Meeting",
+            "start_datetime": state.meeting_datetime,
+            "description": f"Meeting with {state.name}",
+            "duration_minutes": 30,
+        }
         try:
-            await calendar_service.create_event(
-                title=state.meeting_title or "Meeting",
-                start_datetime=state.meeting_datetime,
-                description=f"Meeting with {state.name}",
-                duration_minutes=30,
-                access_token=state.google_access_token,
-            )
-
-            # Dynamic Success Message + Ask about another event
-            final_response = await generate_response(
-                state,
-                goal="Confirm the meeting was successfully created. Then ask if they would like to schedule ANOTHER event.",
+            # Fail now on bad input; the insert itself is batched
+            get_calendar_service().validate_event(
+                event["title"], event["start_datetime"]
             )
+            state.pending_events = [*state.pending_events, event]
+            if len(state.pending_events) >= MAX_PENDING_EVENTS:
+                outcome = await _flush_outcome(state)
+                goal = f"{outcome} Then ask if they would like to schedule ANOTHER event."
+            else:
+                # Not inserted yet: only claim success once the batch has run
+                goal = "Confirm you have the meeting details and will add it to their calendar when they are done. Then ask if they would like to schedule ANOTHER event."
+
+            final_response = await generate_response(state, goal=goal)
             state.system_message = final_response
             state.is_confirmed = True
             state.step = "HANDLE_NEW_LOOP" 
 
         except GoogleCalendarError:
             logger.exception("Calendar error")
-            state.system_message = "I encountered an issue connecting to the calendar. Please try again later."
+            state.system_message = CALENDAR_ERROR_MESSAGE
             state.is_confirmed = False
             state.step = "END"
 
     elif intent == "no":
-        state.system_message = (
-            "Okay, I've cancelled the request. Let me know if you need anything else."
-        )
+        state.system_message = CANCELLED_MESSAGE
         state.is_confirmed = False
         state.step = "END"
+        try:
+            # Events confirmed earlier in the session still get created
+            outcome = await _flush_outcome(state)
+            if outcome:
+                state.system_message = await generate_response(
+                    state,
+                    goal=f"Tell them this meeting was cancelled. {outcome} Then politely say goodbye.",
+                )
+        except GoogleCalendarError:
+            logger.exception("Calendar error")
+            state.system_message = CALENDAR_ERROR_MESSAGE
 
     else:
-        state.system_message = "I'm not sure if you want to confirm. Please say yes to confirm or no to cancel."
+        state.system_message = CONFIRM_UNCLEAR_MESSAGE
         state.step = "AWAIT_CONFIRMATION"
 
-    return state.dict()
+    return _updates(
+        state,
+        "system_message",
+        "step",
+        "is_confirmed",
+        "pending_events",
+        *EXTRACTED_FIELDS,
+    )
 
 
 async def handle_new_loop_node(state: ConversationState) -> dict:
-    logger.info("[HANDLE_NEW_LOOP_NODE] Executing")
+    logger.debug("[HANDLE_NEW_LOOP_NODE] Executing")
 
-    state.confirmation_status = None
-    state = await extract_fields(state, state.last_user_message)
+    state.confirmation_status = classify_confirmation(state.last_user_message)
+    if state.confirmation_status is None:
+        state = await extract_fields(state, state.last_user_message)
 
     intent = state.confirmation_status
-    logger.info("Loop intent: %s", intent)
+    logger.debug("Loop intent: %s", intent)
 
     if intent == "yes":
         # RESET STATE for new event
-        logger.info("User wants another event. Resetting state.")
+        logger.debug("User wants another event. Resetting state.")
         state.name = None
         state.meeting_datetime = None
         state.meeting_title = None
         state.is_confirmed = False
         state.confirmation_status = None
+        state.last_extracted_hash = ""
+        state.chat_history = []
 
         # Ask for name again
         response = await generate_response(
@@ -226,16 +511,30 @@ async def handle_new_loop_node(state: ConversationState) -> dict:
         state.step = "ASK_NAME"
 
     elif intent == "no":
-        response = await generate_response(
-            state, goal="Politely say goodbye and end the session."
-        )
+        try:
+            outcome = await _flush_outcome(state)
+            if outcome:
+                goal = f"{outcome} Then politely say goodbye and end the session."
+            else:
+                goal = "Politely say goodbye and end the session."
+            response = await generate_response(state, goal=goal)
+        except GoogleCalendarError:
+            logger.exception("Calendar error")
+            response = CALENDAR_ERROR_MESSAGE
         state.system_message = response
         state.step = "END"
 
     else:
-        state.system_message = (
-            "I didn't catch that. Do you want to schedule another event? Yes or No?"
-        )
+        state.system_message = LOOP_UNCLEAR_MESSAGE
         state.step = "HANDLE_NEW_LOOP"
 
-    return state.dict()
+    return _updates(
+        state,
+        "system_message",
+        "step",
+        "is_confirmed",
+        "pending_events",
+        "last_extracted_hash",
+        "chat_history",
+        *EXTRACTED_FIELDS,
+    )
@@ -7,37 +7,55 @@ Serves frontend, handles WebSocket, and applies middleware.
 
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 import asyncio
+import logging
 
-from app.websocket import websocket_endpoint
+from app.websocket import FIXED_REPLIES, websocket_endpoint
 from app.utils.logger import setup_logging
 from app.tts.kokoro import KokoroTTSService
 from app.stt.whisper import WhisperSTTService
+from app.calendar.http_session import close_client
+from app.nlu import groq_client
+from app.utils.datetime_parser import parse_datetime
 
 # Logging
 setup_logging()
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Voice Scheduling Assistant")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Preload heavy models before serving and release shared clients after.
+    Kokoro and Whisper load in parallel threads, so startup takes as long
+    as the slower of the two rather than their sum. Fixed replies are
+    synthesized along with the Kokoro load so they never wait on TTS.
+    """
+    logger.info("Preloading TTS (Kokoro) and STT (Whisper) models...")
+    await asyncio.gather(
+        asyncio.to_thread(KokoroTTSService.prerender, FIXED_REPLIES),
+        asyncio.to_thread(WhisperSTTService._load_model),
+        # dateparser loads its language data and builds its regexes lazily;
+        # the phrase must miss the regex fast path to reach dateparser at all
+        asyncio.to_thread(parse_datetime, "next monday evening"),
+        groq_client.warm_up(),
+    )
+    _index_html()
+    logger.info("All models preloaded successfully")
 
-# Startup: Preload Models
-@app.on_event("startup")
-async def startup_event():
-    """Preload heavy models on server startup to speed up first requests."""
-    import logging
-
-    logger = logging.getLogger(__name__)
+    yield
 
-    logger.info("Preloading TTS model (Kokoro)...")
-    KokoroTTSService._init_pipeline()
+    # Release pooled connections held by long-lived service clients
+    await close_client()
+    await groq_client.close()
 
-    logger.info("Preloading STT model (Whisper)...")
-    WhisperSTTService._load_model()
 
-    logger.info("All models preloaded successfully")
+app = FastAPI(title="Voice Scheduling Assistant", lifespan=lifespan)
 
 
 # Middleware
@@ -58,11 +76,11 @@ app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
 from app.config import settings
 
 
-@app.get("/", response_class=HTMLResponse)
-async def serve_frontend():
+@lru_cache(maxsize=1)
+def _index_html() -> bytes:
     """
-    Serve the main frontend HTML page.
-    Injects configuration from settings (e.g. Google Client ID) into the HTML.
+    Read index.html and inject configuration (e.g. Google Client ID) once.
+    Settings are frozen, so the rendered page never changes at runtime.
     """
     html_content = (FRONTEND_DIR / "index.html").read_text(encoding="utf-8")
 
@@ -72,7 +90,13 @@ async def serve_frontend():
             "YOUR_GOOGLE_CLIENT_ID_HERE", settings.GOOGLE_CLIENT_ID
         )
 
-    return html_content
+    return html_content.encode("utf-8")
+
+
+@app.get("/", response_class=HTMLResponse)
+async def serve_frontend():
+    """Serve the main frontend HTML page from memory."""
+    return Response(content=_index_html(), media_type="text/html")
 
 
 # WebSocket Route
@@ -1,13 +1,12 @@
 import os
-import json
+import re
 import asyncio
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from datetime import datetime
-from zoneinfo import ZoneInfo
 
-from groq import Groq
-from pydantic import ValidationError
+import orjson
 
 from app.state import ConversationState
 from app.config import settings
@@ -16,9 +15,11 @@ from app.nlu.validators import (
     validate_meeting_datetime,
     validate_meeting_title,
 )
-from app.utils.datetime_parser import parse_datetime
+from app.utils.datetime_parser import get_timezone, parse_datetime
 from app.nlu.prompts import SYSTEM_PROMPT, USER_PROMPT
 from app.nlu.schemas import ExtractionFields
+from app.nlu.groq_client import client
+from app.nlu.usage import log_usage
 from app.utils.logger import setup_logging
 
 
@@ -27,10 +28,6 @@ from app.utils.logger import setup_logging
 logger = logging.getLogger(__name__)
 # Groq Client ------------------------------------
 
-GROQ_API_KEY = settings.GROQ_API_KEY
-
-client = Groq(api_key=GROQ_API_KEY)
-
 MODEL_NAME = settings.GROQ_MODEL_NAME
 REQUEST_TIMEOUT = settings.LLM_REQUEST_TIMEOUT
 MAX_RETRIES = settings.LLM_MAX_RETRIES
@@ -38,9 +35,45 @@ GROQ_TEMPERATURE = settings.GROQ_TEMPERATURE
 GROQ_MAX_TOKENS = settings.GROQ_MAX_TOKENS
 GROQ_TOP_P = settings.GROQ_TOP_P
 
+# USER_PROMPT split once around its only placeholder; the literal braces are
+# unescaped here since the halves are concatenated rather than .format()ed.
+_USER_PREFIX, _USER_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in USER_PROMPT.split("{user_message}")
+)
+
+
+# Keys the LLM is asked to return, per the ExtractionFields schema
+EXTRACTION_KEYS = tuple(ExtractionFields.model_fields)
+
+# Extraction Cache ------------------------------------
+
+# Raw LLM dicts keyed by normalized message; the datetime phrase is parsed
+# against "now" after lookup, so relative phrases stay correct on a hit.
+EXTRACTION_CACHE_SIZE = 512
+_extraction_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Bare confirmation replies never need the LLM
+CONFIRMATION_SHORTCUTS = {
+    "yes": "yes",
+    "yeah": "yes",
+    "yep": "yes",
+    "sure": "yes",
+    "confirm": "yes",
+    "no": "no",
+    "nope": "no",
+    "cancel": "no",
+    "skip": "no",
+    "none": "no",
+}
+
 # Helpers ---------------------------------------------
 
 
+# Greedy: first "{" to last "}", same span the old find/rfind scan produced
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.S)
+
+
 def _safe_json_parse(text: str) -> Dict[str, Any]:
     """
     Safely extract JSON from LLM output.
@@ -51,39 +84,38 @@ def _safe_json_parse(text: str) -> Dict[str, Any]:
 
     # Direct attempt
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
 
     # Fallback: extract first JSON object in the text
-    start = text.find("{")
-    end = text.rfind("}")
-
-    if start != -1 and end != -1 and start < end:
+    match = _JSON_OBJ_RE.search(text)
+    if match:
         try:
-            return json.loads(text[start : end + 1])
-        except json.JSONDecodeError:
+            return orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
             pass
 
     logger.warning("Failed to parse JSON from LLM output: %s", text)
     return {}
 
 
-def _call_groq(user_message: str) -> Dict[str, Any]:
+async def _call_groq(user_message: str) -> Dict[str, Any]:
     """
-    Blocking Groq call. Must run in executor.
+    Single async Groq call; runs on the event loop, no executor hop.
     """
-    completion = client.chat.completions.create(
+    completion = await client.chat.completions.create(
         model=MODEL_NAME,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": USER_PROMPT.format(user_message=user_message)},
+            {"role": "user", "content": _USER_PREFIX + user_message + _USER_SUFFIX},
         ],
         temperature=GROQ_TEMPERATURE,
         max_completion_tokens=GROQ_MAX_TOKENS,
         top_p=GROQ_TOP_P,
     )
 
+    log_usage("EXTRACT_FIELDS", completion)
     content = completion.choices[0].message.content
     return _safe_json_parse(content)
 
@@ -92,11 +124,10 @@ async def _run_with_retries(user_message: str) -> Dict[str, Any]:
     """
     Async wrapper with retries and timeout protection.
     """
-    loop = asyncio.get_running_loop()
     for attempt in range(1, MAX_RETRIES + 1):
         try:
             return await asyncio.wait_for(
-                loop.run_in_executor(None, _call_groq, user_message),
+                _call_groq(user_message),
                 timeout=REQUEST_TIMEOUT,
             )
         except asyncio.TimeoutError:
@@ -106,6 +137,64 @@ async def _run_with_retries(user_message: str) -> Dict[str, Any]:
     return {}
 
 
+# Cache-key canonicalization: collapses spelling/filler variants of the same
+# utterance without touching anything an extracted value could come from.
+# Hesitation sounds are dropped only as a lead-in, and discourse words only
+# when set off by a comma ("Well, tomorrow" but not "Well Being session").
+# Case and inner punctuation ("Mary-Jane", "3.30", "5/6") are kept.
+_LEADING_FILLER_RE = re.compile(
+    r"^(?:(?:um+|uh+|er+|hmm+)\b[\s,.!?]*|(?:so|well|ok(?:ay)?)\s*,\s*)+", re.I
+)
+_TRAILING_PUNCT = ".!? "
+_CANONICAL_WORDS = {
+    "tmrw": "tomorrow",
+    "tmr": "tomorrow",
+    "tmw": "tomorrow",
+    "tomorow": "tomorrow",
+    "tonite": "tonight",
+    "mins": "minutes",
+    "min": "minutes",
+    "hrs": "hours",
+    "hr": "hours",
+    "o'clock": "",
+    "oclock": "",
+}
+
+
+def _normalize_message(user_message: str) -> str:
+    text = _LEADING_FILLER_RE.sub("", user_message.strip()).rstrip(_TRAILING_PUNCT)
+    words = (_CANONICAL_WORDS.get(word, word) for word in text.split())
+    return " ".join(word for word in words if word)
+
+
+async def _cached_extraction(user_message: str) -> Dict[str, Any]:
+    """
+    Serve repeated utterances from the LRU cache before calling Groq.
+    Empty (failed) results are not cached so the next turn retries.
+    """
+    key = _normalize_message(user_message)
+    if not key:
+        # Nothing but filler: not worth sharing a cache slot
+        return await _run_with_retries(user_message)
+
+    shortcut = CONFIRMATION_SHORTCUTS.get(key.lower())
+    if shortcut:
+        return {"confirmation_status": shortcut}
+
+    cached = _extraction_cache.get(key)
+    if cached is not None:
+        _extraction_cache.move_to_end(key)
+        logger.debug("[EXTRACT_FIELDS] Cache hit for: %s", key)
+        return cached
+
+    raw_output = await _run_with_retries(user_message)
+    if raw_output:
+        _extraction_cache[key] = raw_output
+        if len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+    return raw_output
+
+
 # Main Extraction ------------------------------------
 
 
@@ -117,57 +206,59 @@ async def extract_fields(
     Extract structured fields from user input using LLM.
     Fully async, retry-protected, schema-validated.
     """
-    logger.info("[EXTRACT_FIELDS] Called with user_message: %s", user_message)
+    logger.debug("[EXTRACT_FIELDS] Called with user_message: %s", user_message)
 
-    raw_output = await _run_with_retries(user_message)
-    logger.info("[EXTRACT_FIELDS] LLM raw output: %s", raw_output)
+    raw_output = await _cached_extraction(user_message)
+    logger.debug("[EXTRACT_FIELDS] LLM raw output: %s", raw_output)
     if not raw_output:
         return state
 
-    # ---------------- Pydantic schema enforcement ---------------- #
-    try:
-        fields = ExtractionFields(**raw_output)
-    except ValidationError as e:
-        logger.warning(
-            "Schema validation failed. Raw output: %s | Error: %s",
-            raw_output,
-            e,
-        )
+    # ---------------- Schema enforcement ---------------- #
+    # Same contract as ExtractionFields (every field an optional string),
+    # checked on the dict directly instead of building a model per turn.
+    if not isinstance(raw_output, dict) or not all(
+        isinstance(raw_output.get(key), (str, type(None))) for key in EXTRACTION_KEYS
+    ):
+        logger.warning("Schema validation failed. Raw output: %s", raw_output)
         return state
 
+    datetime_text = raw_output.get("meeting_datetime_text")
+    confirmation = raw_output.get("confirmation_status")
+
     # ---------------- Validators ---------------- #
-    name = validate_name(fields.name)
-    title = validate_meeting_title(fields.meeting_title)
+    name = validate_name(raw_output.get("name"))
+    title = validate_meeting_title(raw_output.get("meeting_title"))
 
-    logger.info(
+    logger.debug(
+        "[EXTRACT_FIELDS] Validated name=%s title=%s datetime_text=%s",
         name,
         title,
-        fields.meeting_datetime_text,
+        datetime_text,
     )
 
     # ---------------- Confirmation Status ---------------- #
-    if fields.confirmation_status:
-        val = fields.confirmation_status.lower().strip()
+    if confirmation:
+        val = confirmation.lower().strip()
         if val in {"yes", "no", "uncertain"}:
             state.confirmation_status = val
-            logger.info("Updated state.confirmation_status to: %s", val)
+            logger.debug("Updated state.confirmation_status to: %s", val)
 
     meeting_datetime: Optional[datetime] = None
 
-    if fields.meeting_datetime_text:
+    if datetime_text:
 
-        user_tz = ZoneInfo(state.timezone or "UTC")
+        user_tz = get_timezone(state.timezone or "UTC")
         now = datetime.now(user_tz)
         parsed_dt = parse_datetime(
-            fields.meeting_datetime_text,
+            datetime_text,
             now=now,
             tz=user_tz,
         )
 
         if not parsed_dt:
-            logger.info(
+            logger.debug(
                 "Date parsing failed for text: %s",
-                fields.meeting_datetime_text,
+                datetime_text,
             )
         else:
             validated_dt = validate_meeting_datetime(parsed_dt, now=now)
@@ -175,7 +266,7 @@ async def extract_fields(
             if validated_dt:
                 meeting_datetime = validated_dt
             else:
-                logger.info(
+                logger.debug(
                     "Parsed datetime failed validation: %s",
                     parsed_dt,
                 )
@@ -183,14 +274,14 @@ async def extract_fields(
     # ---------------- Defensive state updates ---------------- #
     if name and not state.name:
         state.name = name
-        logger.info("Updated state.name to: %s", name)
+        logger.debug("Updated state.name to: %s", name)
 
     if meeting_datetime and not state.meeting_datetime:
         state.meeting_datetime = meeting_datetime
-        logger.info("Updated state.meeting_datetime to: %s", meeting_datetime)
+        logger.debug("Updated state.meeting_datetime to: %s", meeting_datetime)
 
     if title and not state.meeting_title:
         state.meeting_title = title
-        logger.info("Updated state.meeting_title to: %s", title)
+        logger.debug("Updated state.meeting_title to: %s", title)
 
     return state
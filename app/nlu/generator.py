@@ -1,18 +1,16 @@
 import logging
 from typing import Optional
 
-from groq import AsyncGroq
 from app.state import ConversationState
 from app.config import settings
+from app.nlu.groq_client import client
+from app.nlu.usage import log_usage
 
 logger = logging.getLogger(__name__)
 
 
 MODEL_NAME = settings.GROQ_MODEL_NAME
 
-# Initialize Groq client
-client = AsyncGroq(api_key=settings.GROQ_API_KEY)
-
 # Main System Prompt
 SYSTEM_PROMPT = """You are a helpful, professional, and friendly voice assistant for a scheduling agent. 
 Your output will be spoken aloud, so it MUST be:
@@ -24,6 +22,45 @@ Your output will be spoken aloud, so it MUST be:
 Your task is to generate the next response based on the "Current Goal" and "Context".
 """
 
+# Static instructions for reading the per-turn fields. Sent with the system
+# prompt so the cached prefix (system + chat history) ends before anything
+# that changes within a turn.
+STATIC_PREAMBLE = """Write the assistant's next spoken line.
+The Current Goal says what the line must achieve; the Context Note adds any extra
+detail (e.g. an invalid date). Use the known details below only when they
+help the goal, and never invent missing ones.
+Reply with the line only, without quotes or labels.
+"""
+
+_SYSTEM_CONTENT = SYSTEM_PROMPT + "\n" + STATIC_PREAMBLE
+
+
+# Spoken whenever generation fails
+FALLBACK_RESPONSE = "I'm sorry, I process that. Could you please repeat?"
+
+
+def _build_messages(
+    state: ConversationState, goal: str, context_note: Optional[str]
+) -> list:
+    user_msg = state.last_user_message or "(No message yet)"
+
+    # Stable prefix of system + past turns, then only this turn's fields
+    return [
+        {"role": "system", "content": _SYSTEM_CONTENT},
+        *state.chat_history,
+        {
+            "role": "user",
+            "content": f"""
+Current Goal: {goal}
+Context Note: {context_note or "None"}
+User's Name: {state.name or "Unknown"}
+Meeting Title: {state.meeting_title or "Not set"}
+Meeting Time: {state.meeting_datetime or "Not set"}
+Last User Message: "{user_msg}"
+""",
+        },
+    ]
+
 
 async def generate_response(
     state: ConversationState, goal: str, context_note: Optional[str] = None
@@ -40,38 +77,17 @@ async def generate_response(
         str: The generated response text
     """
     try:
-        user_msg = state.last_user_message or "(No message yet)"
-
-        # Build prompt inputs
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {
-                "role": "user",
-                "content": f"""
-Current Goal: {goal}
-Context Note: {context_note or "None"}
-
-User's Name: {state.name or "Unknown"}
-Meeting Title: {state.meeting_title or "Not set"}
-Meeting Time: {state.meeting_datetime or "Not set"}
-
-Last User Message: "{user_msg}"
-
-Generate the response now:
-""",
-            },
-        ]
-
         logger.info("[GENERATOR] Generating response for goal: '%s'", goal)
 
         # Call Groq
         chat_completion = await client.chat.completions.create(
-            messages=messages,
-            model=MODEL_NAME, 
+            messages=_build_messages(state, goal, context_note),
+            model=MODEL_NAME,
             temperature=0.7,
             max_tokens=60,
         )
 
+        log_usage("GENERATOR", chat_completion)
         response_text = chat_completion.choices[0].message.content.strip()
 
         if response_text.startswith('"') and response_text.endswith('"'):
@@ -82,4 +98,4 @@ Generate the response now:
 
     except Exception as e:
         logger.error("[GENERATOR] Failed to generate response: %s", e)
-        return "I'm sorry, I process that. Could you please repeat?"
+        return FALLBACK_RESPONSE
@@ -0,0 +1,42 @@
+"""
+Shared Groq client
+
+Responsibilities:
+- Own one AsyncGroq client (and HTTP/2 connection pool) for the extractor
+  and the generator
+- Warm the pool on startup and close it on shutdown
+"""
+
+import logging
+
+import httpx
+from groq import AsyncGroq
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Extractor and generator calls from concurrent sessions multiplex over
+# the same connection instead of each module holding its own pool.
+client = AsyncGroq(
+    api_key=settings.GROQ_API_KEY,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    ),
+)
+
+
+async def warm_up() -> None:
+    """Open the pooled connection before the first user turn."""
+    try:
+        # Cheap authenticated GET; don't let a slow network stall startup
+        await client.with_options(max_retries=0, timeout=5.0).models.list()
+        logger.info("Groq connection pool warmed")
+    except Exception as e:
+        logger.warning("Groq warm-up failed: %s", e)
+
+
+async def close() -> None:
+    """Close the pooled connection. Called on application shutdown."""
+    await client.close()
@@ -0,0 +1,31 @@
+import re
+from typing import Optional
+
+
+# Confirmation Intent --------------------------------
+# Local yes/no rules for the confirmation nodes. A message that matches
+# neither, or both ("yes, no wait"), is left to the LLM extractor. Negators
+# count as "no" so a negated yes ("not sure", "that's not correct") is
+# ambiguous rather than a confirmation.
+
+_YES_RE = re.compile(
+    r"\b(?:yes|yeah|yep|yup|y|sure|confirm|correct|do it|go ahead|ok(?:ay)?|please)\b",
+    re.I,
+)
+_NO_RE = re.compile(
+    r"\b(?:no|nope|nah|n|cancel|stop|don'?t|never mind|skip"
+    r"|not|isn'?t|aren'?t|doesn'?t|can'?t|won'?t|wrong|incorrect)\b",
+    re.I,
+)
+
+
+def classify_confirmation(message: Optional[str]) -> Optional[str]:
+    """Return "yes" or "no" when the rules are unambiguous, else None."""
+    if not message:
+        return None
+
+    is_yes = _YES_RE.search(message) is not None
+    is_no = _NO_RE.search(message) is not None
+    if is_yes == is_no:
+        return None
+    return "yes" if is_yes else "no"
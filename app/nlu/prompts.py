@@ -16,10 +16,9 @@ Rules:
 """
 
 
+# Static format block first so the provider's automatic prefix cache covers
+# everything up to the per-turn user message.
 USER_PROMPT = """
-User message:
-"{user_message}"
-
 Return JSON in this exact format:
 {{
   "name": null,
@@ -27,4 +26,7 @@ Return JSON in this exact format:
   "meeting_title": null,
   "confirmation_status": null
 }}
+
+User message:
+"{user_message}"
 """
@@ -0,0 +1,36 @@
+import logging
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def extract_tokens(completion: Any) -> Dict[str, int]:
+    """
+    Pull prompt/completion/cached token counts off a Groq completion.
+    Groq caches prompt prefixes automatically and reports hits under
+    usage.prompt_tokens_details.cached_tokens; missing fields count as 0.
+    """
+    usage = getattr(completion, "usage", None)
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+    }
+
+
+def log_usage(tag: str, completion: Any) -> None:
+    """Debug-log token usage for cost tracking."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    tokens = extract_tokens(completion)
+    logger.debug(
+        "[%s] tokens prompt=%s cached=%s completion=%s",
+        tag,
+        tokens["prompt_tokens"],
+        tokens["cached_tokens"],
+        tokens["completion_tokens"],
+    )
@@ -4,6 +4,14 @@ import re
 
 
 #  Name Validation --------------------------------
+
+# Only letters, spaces, hyphens and apostrophes
+_NAME_RE = re.compile(r"[A-Za-z\s\-']+")
+
+# Common non-name replies
+_NAME_BLACKLIST = frozenset({"yes", "yeah", "ok", "okay", "no", "sure"})
+
+
 def validate_name(name: Optional[str]) -> Optional[str]:
     if not name:
         return None
@@ -13,12 +21,11 @@ def validate_name(name: Optional[str]) -> Optional[str]:
         return None
 
     # Only allow letters, spaces, hyphens
-    if not re.fullmatch(r"[A-Za-z\s\-']+", name):
+    if not _NAME_RE.fullmatch(name):
         return None
 
     # Reject common non-name replies
-    blacklist = {"yes", "yeah", "ok", "okay", "no", "sure"}
-    if name.lower() in blacklist:
+    if name.lower() in _NAME_BLACKLIST:
         return None
     return name
 
@@ -52,6 +59,9 @@ def validate_meeting_datetime(
 
 # Title Validation --------------------------------
 
+# Prompt-injection markers; one case-insensitive scan instead of a loop
+_FORBIDDEN_RE = re.compile(r"ignore previous|system message|assistant:|user:", re.I)
+
 
 def validate_meeting_title(title: Optional[str]) -> Optional[str]:
     if not title:
@@ -63,15 +73,7 @@ def validate_meeting_title(title: Optional[str]) -> Optional[str]:
     if len(title) < 3 or len(title) > 100:
         return None
 
-    forbidden_phrases = [
-        "ignore previous",
-        "system message",
-        "assistant:",
-        "user:",
-    ]
-
-    lowered = title.lower()
-    if any(phrase in lowered for phrase in forbidden_phrases):
+    if _FORBIDDEN_RE.search(title):
         return None
 
     return title
@@ -0,0 +1,67 @@
+"""
+sessions.py
+
+Bounded in-memory store for per-connection conversation state and other
+short-lived per-user lookups.
+
+Responsibilities:
+- Keep the most recently written entries, up to a fixed count
+- Expire entries not rewritten within a TTL
+- Stay bounded even when clients vanish without a clean disconnect
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SessionStore(Generic[K, V]):
+    """
+    LRU map with an idle TTL; every write refreshes the entry's expiry.
+
+    Writes move the entry to the back, so entries stay ordered by expiry
+    and eviction only ever looks at the front.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def __setitem__(self, key: K, value: V) -> None:
+        now = time.monotonic()
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        self._evict(now)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        item = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            return default
+        return item[1]
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and anything beyond maxsize, oldest first."""
+        while self._data:
+            key, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                if len(self._data) <= self.maxsize:
+                    break
+                # Still live: only the size cap pushes it out
+                logger.warning("Evicting live entry %s: store at capacity", key)
+            else:
+                logger.debug("Evicting expired entry %s", key)
+            del self._data[key]
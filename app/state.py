@@ -1,6 +1,6 @@
-from typing import Optional, Literal
+from typing import Any, Dict, List, Optional, Literal
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 ConversationStep = Literal[
     "START",
@@ -21,6 +21,11 @@ class ConversationState(BaseModel):
     This is what drives the workflow not the LLM.
     """
 
+    # Nodes assign trusted values on every turn; keep setattr unvalidated.
+    # Workflow output is rebuilt with model_construct, which skips validation
+    # and so needs unknown keys ignored.
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     step: str = "START"
     timezone: Optional[str] = "Asia/Kolkata"
 
@@ -38,6 +43,15 @@ class ConversationState(BaseModel):
         default=None, description="What the system wants to say next"
     )
 
+    # Completed turns as chat messages, oldest first; trimmed in run_step
+    chat_history: List[Dict[str, str]] = Field(default_factory=list)
+
+    # blake2b digest of the last message whose extraction filled a slot
+    last_extracted_hash: str = ""
+
+    # Confirmed events awaiting one batched calendar insert
+    pending_events: List[Dict[str, Any]] = Field(default_factory=list)
+
     is_confirmed: Optional[bool] = False
     confirmation_status: Optional[Literal["yes", "no", "uncertain"]] = None
 
@@ -4,7 +4,7 @@ whisper.py
 Production-grade Speech-to-Text (STT) service using FasterWhisper.
 
 Features:
-- Accepts any audio format (mp3, wav, ogg, etc.) and converts to 16kHz mono WAV.
+- Accepts any audio format (mp3, wav, ogg, etc.) and decodes to 16kHz mono float32.
 - Async transcription using thread pool.
 - Handles float32 conversion for ONNX compatibility.
 - Clear domain-specific error handling.
@@ -18,20 +18,23 @@ Usage:
 """
 
 import asyncio
-import io
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import os
+import subprocess
 from typing import Optional
 
+import ctranslate2
 import numpy as np
-import soundfile as sf
-from pydub import AudioSegment
 from faster_whisper import WhisperModel
 
+from app.concurrency import stt_pool
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Whisper expects 16kHz input
+SAMPLE_RATE = 16000
+
 
 class STTError(Exception):
     """Custom exception for STT-related errors."""
@@ -42,26 +45,56 @@ class WhisperSTTService:
     Production-grade asynchronous STT service built on FasterWhisper.
 
     Responsibilities:
-    - Accept any audio format and convert to WAV (16kHz mono, float32)
+    - Accept any audio format and decode to 16kHz mono float32
     - Perform async speech-to-text transcription
     - Surface clear, domain-specific errors
     """
 
     _model: Optional[WhisperModel] = None
-    _executor = ThreadPoolExecutor(max_workers=2)
 
     # Model Loading --------------------------------
     @classmethod
     def _load_model(cls):
         if cls._model is None:
-            logger.info("Loading Whisper model: %s", settings.WHISPER_MODEL)
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            compute_type = cls._compute_type(device)
+            logger.info(
+                "Loading Whisper model: %s (%s, %s)",
+                settings.WHISPER_MODEL,
+                device,
+                compute_type,
+            )
             cls._model = WhisperModel(
                 settings.WHISPER_MODEL,
-                device="cpu",
-                compute_type="int8",
+                device=device,
+                compute_type=compute_type,
+                # Leave a core for the event loop and TTS, and split the
+                # rest between concurrent transcriptions
+                cpu_threads=max(
+                    1, ((os.cpu_count() or 1) - 1) // settings.STT_CONCURRENCY
+                ),
+                num_workers=1,
             )
         return cls._model
 
+    @staticmethod
+    def _compute_type(device: str) -> str:
+        """
+        Pick a quantization the device actually has kernels for.
+
+        int8 weights everywhere, fp16 activations only on GPU. An unsupported
+        type would otherwise be silently emulated on a slow path, so walk
+        down to int8 / float32 based on what ctranslate2 reports.
+        """
+        preferred = (
+            "int8_float16" if device == "cuda" else settings.WHISPER_COMPUTE_TYPE
+        )
+        supported = ctranslate2.get_supported_compute_types(device)
+        for candidate in (preferred, "int8", "float32"):
+            if candidate in supported:
+                return candidate
+        return "default"
+
     # Public Async Method
     @classmethod
     async def transcribe(cls, audio_bytes: bytes) -> str:
@@ -75,7 +108,7 @@ class WhisperSTTService:
 
         try:
             text = await loop.run_in_executor(
-                cls._executor,
+                stt_pool,
                 cls._sync_transcribe,
                 audio_bytes,
             )
@@ -92,53 +125,64 @@ class WhisperSTTService:
         """
         model = cls._load_model()
 
-        # Step 1: Convert to WAV, 16kHz, mono
-        try:
-            audio_wav = cls._convert_to_wav(audio_bytes)
-        except Exception as e:
-            raise STTError(f"Failed to convert audio: {e}") from e
-
-        # Step 2: Load audio into NumPy
-        try:
-            audio_np, sr = sf.read(io.BytesIO(audio_wav))
-        except Exception as e:
-            raise STTError(f"Failed to read WAV: {e}") from e
-
-        # Step 3: Ensure correct sample rate
-        if sr != 16000:
-            raise STTError(f"Expected 16kHz audio, got {sr}")
+        # Step 1: Decode straight to 16kHz mono float32 samples
+        audio_np = cls._decode_audio(audio_bytes)
+        if not audio_np.size:
+            raise STTError("Decoded audio is empty")
 
-        # Step 4: Convert to float32 for ONNX
-        audio_np = audio_np.astype("float32")
-
-        # Step 5: Transcribe
+        # Step 2: Transcribe
         try:
             segments, _ = model.transcribe(
                 audio_np,
                 language=settings.WHISPER_LANGUAGE,
                 vad_filter=True,
+                # Short single-utterance clips: greedy decoding, no timestamps
+                # and no cross-segment prompt, since only the joined text is used
+                beam_size=1,
+                best_of=1,
+                condition_on_previous_text=False,
+                without_timestamps=True,
             )
         except Exception as e:
             raise STTError(f"Whisper transcription failed: {e}") from e
 
-        # Step 6: Combine text
+        # Step 3: Combine text
         text = " ".join(seg.text.strip() for seg in segments)
         if not text:
             raise STTError("Empty transcription result")
 
         return text
 
-    # Audio Conversion
+    # Audio Decoding
     @staticmethod
-    def _convert_to_wav(audio_bytes: bytes) -> bytes:
+    def _decode_audio(audio_bytes: bytes) -> np.ndarray:
         """
-        Convert any audio format to WAV 16kHz mono, float32 bytes.
+        Decode any audio format to 16kHz mono float32 samples.
+
+        One ffmpeg pass writes raw f32le to stdout, which is wrapped without
+        a copy; no intermediate WAV encode/parse or dtype cast. The cache:
+        protocol makes the piped input seekable, which mp4/m4a recordings
+        with a trailing moov atom (Safari's MediaRecorder) need.
         """
         try:
-            audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
-            audio = audio.set_channels(1).set_frame_rate(16000)
-            buf = io.BytesIO()
-            audio.export(buf, format="wav")
-            return buf.getvalue()
+            proc = subprocess.run(
+                [
+                    "ffmpeg",
+                    "-loglevel", "error",
+                    "-i", "cache:pipe:0",
+                    "-f", "f32le",
+                    "-ac", "1",
+                    "-ar", str(SAMPLE_RATE),
+                    "pipe:1",
+                ],
+                input=audio_bytes,
+                capture_output=True,
+                check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            detail = e.stderr.decode(errors="replace").strip()
+            raise STTError(f"Audio conversion failed: {detail}") from e
         except Exception as e:
             raise STTError(f"Audio conversion failed: {e}") from e
+
+        return np.frombuffer(proc.stdout, dtype=np.float32)
@@ -1,17 +1,26 @@
 import logging
 import asyncio
-import base64
-from io import BytesIO
-from typing import Optional
+import os
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
 
 import numpy as np
-import soundfile as sf
+import torch
 from kokoro import KPipeline
 
+from app.concurrency import tts_pool
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Frames yielded by KokoroTTSService.stream(): raw mono int16 at Kokoro's rate
+PCM_FORMAT = {"encoding": "pcm_s16le", "sample_rate": 24000, "channels": 1}
+
+# Recently streamed dynamic replies. The generator samples (temperature 0.7),
+# so hits come from text reused verbatim, mainly START greetings served from
+# the graph's greeting cache on reconnect. ~250 KB per 5 s reply.
+RECENT_PCM_CACHE_SIZE = 32
+
 
 class TTSError(Exception):
     """Base exception for TTS-related failures."""
@@ -23,13 +32,17 @@ class KokoroTTSService:
     """
     Class-level TTS service:
     - Converts text → speech
-    - Returns base64 WAV audio
+    - Streams raw PCM16 chunks
     - Does NOT perform playback
     """
 
     _pipeline: Optional[KPipeline] = None
     _voice: Optional[str] = None
-    _sample_rate: int = 24000
+    _sample_rate: int = PCM_FORMAT["sample_rate"]
+
+    # PCM chunks for fixed replies, rendered once by prerender()
+    _pcm_cache: Dict[str, List[bytes]] = {}
+    _recent_pcm: "OrderedDict[str, List[bytes]]" = OrderedDict()
 
     # Initialization --------------------------------
     @classmethod
@@ -37,69 +50,101 @@ class KokoroTTSService:
         """Lazy-load the heavy Kokoro pipeline once."""
         if cls._pipeline is None:
             cls._voice = settings.TTS_VOICE
+            # Split the cores between concurrent syntheses instead of letting
+            # each pool thread run a full-width torch thread pool
+            torch.set_num_threads(
+                max(1, (os.cpu_count() or 1) // settings.TTS_CONCURRENCY)
+            )
             cls._pipeline = KPipeline(lang_code="a")
             logger.info("Kokoro TTS pipeline loaded with voice '%s'", cls._voice)
         return cls._pipeline
 
+    @classmethod
+    def prerender(cls, texts: Iterable[str]) -> None:
+        """
+        Load the pipeline and synthesize replies that never change, so
+        stream() serves them from memory. Blocking; run in a thread.
+        """
+        cls._init_pipeline()
+        for text in texts:
+            if text not in cls._pcm_cache:
+                cls._pcm_cache[text] = list(cls._iter_pcm_blocking(text))
+        logger.info("Pre-rendered TTS for %s fixed replies", len(cls._pcm_cache))
+
     #  Internal blocking call --------------------------------
     @classmethod
-    def _synthesize_blocking(cls, text: str) -> bytes:
+    def _iter_pcm_blocking(cls, text: str) -> Iterator[bytes]:
         """
-        Blocking Kokoro synthesis.
-        Must run in executor.
+        Blocking Kokoro synthesis yielding one PCM16 chunk per segment.
+        Each next() must run in executor.
         """
         if not text.strip():
             raise TTSError("Empty text for TTS")
 
         cls._init_pipeline()
 
-        audio_chunks = []
-        generator = cls._pipeline(text, voice=cls._voice)
-
-        for _, _, chunk in generator:
+        for _, _, chunk in cls._pipeline(text, voice=cls._voice):
             if chunk is not None:
-                audio_chunks.append(chunk)
-
-        if not audio_chunks:
-            raise TTSError("Kokoro returned empty audio")
-
-        full_audio = np.concatenate(audio_chunks)
-
-        with BytesIO() as buf:
-            sf.write(buf, full_audio, cls._sample_rate, format="WAV")
-            return buf.getvalue()
+                samples = np.clip(np.asarray(chunk, dtype=np.float32), -1.0, 1.0)
+                yield (samples * 32767).astype("<i2").tobytes()
 
     # Public async API --------------------------------
     @classmethod
-    async def synthesize(
+    async def stream(
         cls,
         text: str,
         timeout: float = 25.0,
-        retries: int = 2,
-    ) -> str:
+    ) -> AsyncIterator[bytes]:
         """
-        Convert text to base64-encoded WAV audio asynchronously.
+        Yield raw PCM16 audio (see PCM_FORMAT) chunk by chunk as Kokoro
+        produces it, so playback can start before the utterance is done.
 
-        Returns:
-            base64 string
+        The next chunk is synthesized while the caller is still sending the
+        current one. Not retried: chunks already yielded can't be taken back.
         """
         if not text or not text.strip():
-            return ""
+            return
 
-        loop = asyncio.get_running_loop()
+        cached = cls._pcm_cache.get(text) or cls._recent_pcm.get(text)
+        if cached:
+            if text in cls._recent_pcm:
+                cls._recent_pcm.move_to_end(text)
+            for pcm in cached:
+                yield pcm
+            return
 
-        for attempt in range(1, retries + 1):
-            try:
-                wav_bytes = await asyncio.wait_for(
-                    loop.run_in_executor(None, cls._synthesize_blocking, text),
-                    timeout=timeout,
-                )
-                return base64.b64encode(wav_bytes).decode("utf-8")
-
-            except asyncio.TimeoutError:
-                logger.warning("TTS timeout (attempt %s)", attempt)
-
-            except Exception as e:
-                logger.exception("TTS failed (attempt %s): %s", attempt, e)
+        loop = asyncio.get_running_loop()
+        chunks = cls._iter_pcm_blocking(text)
+        rendered: List[bytes] = []
+        pending = loop.run_in_executor(tts_pool, next, chunks, None)
+
+        try:
+            while True:
+                try:
+                    pcm = await asyncio.wait_for(pending, timeout=timeout)
+                except asyncio.TimeoutError as e:
+                    raise TTSError("TTS stream timed out") from e
+                except TTSError:
+                    raise
+                except Exception as e:
+                    logger.exception("TTS stream failed: %s", e)
+                    raise TTSError("TTS streaming failed") from e
+
+                if pcm is None:
+                    break
+
+                # Prefetch: synthesis of the next chunk overlaps the send
+                pending = loop.run_in_executor(tts_pool, next, chunks, None)
+                rendered.append(pcm)
+                yield pcm
+        finally:
+            # Caller stopped early; drop the prefetched result unobserved
+            pending.cancel()
+
+        if not rendered:
+            raise TTSError("Kokoro returned empty audio")
 
-        raise TTSError("TTS synthesis failed after retries")
+        # Only complete renders are cached
+        cls._recent_pcm[text] = rendered
+        if len(cls._recent_pcm) > RECENT_PCM_CACHE_SIZE:
+            cls._recent_pcm.popitem(last=False)
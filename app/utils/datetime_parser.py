@@ -5,15 +5,134 @@ Responsibilities:
 - Remain deterministic and side-effect free
 """
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import re
 from typing import Optional
-import dateparser
+from zoneinfo import ZoneInfo
+from dateparser.date import DateDataParser
 import logging
 
 from app.utils.logger import setup_logging
 
 logger = logging.getLogger(__name__)
 
+# The assistant only speaks English; skips dateparser's per-locale scan
+LANGUAGES = ["en"]
+
+
+@lru_cache(maxsize=64)
+def get_timezone(name: str) -> ZoneInfo:
+    """Reuse one ZoneInfo per timezone name across turns."""
+    return ZoneInfo(name)
+
+
+# Fast paths ---------------------------------
+# The most common scheduling phrases, resolved without dateparser. Only
+# unambiguous forms match; anything else falls through unchanged.
+
+# "in 2 hours", "in an hour", "in 30 mins"
+_RE_IN = re.compile(r"in\s+(\d+|an?)\s+(min(?:ute)?|h(?:ou)?r|day|week)s?")
+
+# "tomorrow at 5pm", "today 10:30 a.m.", "tomorrow at 17:00"
+_RE_DAY_AT = re.compile(
+    r"(today|tomorrow)(?:\s+at)?\s+"
+    r"(?:(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\.?|(\d{1,2}):(\d{2}))"
+)
+
+_UNIT_DELTAS = {
+    "min": timedelta(minutes=1),
+    "minute": timedelta(minutes=1),
+    "hr": timedelta(hours=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+
+
+def _parse_fast(text: str, base: datetime) -> Optional[datetime]:
+    """Resolve common relative phrases against base; None on a miss."""
+    text = text.rstrip(".!?")
+
+    match = _RE_IN.fullmatch(text)
+    if match:
+        count, unit = match.groups()
+        n = 1 if count in ("a", "an") else int(count)
+        return base + n * _UNIT_DELTAS[unit]
+
+    match = _RE_DAY_AT.fullmatch(text)
+    if match:
+        day, hour12, minute12, meridiem, hour24, minute24 = match.groups()
+        if hour12 is not None:
+            hour = int(hour12)
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if meridiem == "p" else 0)
+            minute = int(minute12 or 0)
+        else:
+            hour, minute = int(hour24), int(minute24)
+            if hour > 23:
+                return None
+        if minute > 59:
+            return None
+
+        date = base + timedelta(days=1) if day == "tomorrow" else base
+        return date.replace(hour=hour, minute=minute)
+
+    return None
+
+
+def parse_datetime_fast(text: Optional[str], *, now: datetime) -> Optional[datetime]:
+    """
+    Only parse_datetime's regex fast path; never falls back to dateparser.
+
+    Matches when the whole text is one of the common phrases above, resolved
+    against the timezone-aware now; None otherwise.
+    """
+    if not text:
+        return None
+    return _parse_fast(text.strip().lower(), now.replace(second=0, microsecond=0))
+
+
+@lru_cache(maxsize=8)
+def _get_parser(base: datetime, tz_str: str) -> DateDataParser:
+    """
+    DateDataParser bound to one (minute-resolution base time, tz) pair.
+
+    dateparser.parse builds a fresh parser on every call once settings are
+    passed; settings are fixed per instance, so build one per minute instead.
+    """
+    settings = {
+        "RELATIVE_BASE": base,
+        "TIMEZONE": tz_str,
+        "RETURN_AS_TIMEZONE_AWARE": True,
+        "PREFER_DATES_FROM": "future",
+    }
+
+    logger.debug("[PARSE_DATETIME] dateparser settings: %s", settings)
+
+    return DateDataParser(languages=LANGUAGES, settings=settings)
+
+
+@lru_cache(maxsize=4096)
+def _parse_cached(text: str, base: datetime, tz_str: str) -> Optional[datetime]:
+    """
+    dateparser call memoized on (phrase, minute-resolution base time, tz).
+
+    Repeated phrases ("tomorrow 5pm") within the same minute resolve from
+    the cache; a minute of drift doesn't matter for meeting times.
+    """
+    try:
+        dt = _get_parser(base, tz_str).get_date_data(text).date_obj
+        logger.debug("[PARSE_DATETIME] dateparser returned: %s", dt)
+        return dt
+    except Exception as e:
+        # Defensive: dateparser rarely throws, but don't trust external libs
+        logger.error(
+            "[PARSE_DATETIME] Date parsing exception for text='%s': %s", text, e
+        )
+        return None
+
 
 def parse_datetime(
     text: Optional[str],
@@ -40,51 +159,36 @@ def parse_datetime(
     if not now:
         now = datetime.now(tz)
 
-    logger.info(
-        "[PARSE_DATETIME] Attempting to parse: text='%s', now='%s', tz='%s'",
-        text,
-        now.isoformat(),
-        str(tz),
-    )
-
     # Get timezone string - handle both timezone and ZoneInfo
     tz_str = str(tz) if hasattr(tz, "key") else tz.tzname(None)
-    logger.info("[PARSE_DATETIME] Using timezone string: %s", tz_str)
-
-    settings = {
-        "RELATIVE_BASE": now,
-        "TIMEZONE": tz_str,
-        "RETURN_AS_TIMEZONE_AWARE": True,
-        "PREFER_DATES_FROM": "future",
-    }
-
-    logger.info("[PARSE_DATETIME] dateparser settings: %s", settings)
 
-    try:
-        dt = dateparser.parse(text, settings=settings)
-        logger.info("[PARSE_DATETIME] dateparser returned: %s", dt)
-    except Exception as e:
-        # Defensive: dateparser rarely throws, but don't trust external libs
-        logger.error(
-            "[PARSE_DATETIME] Date parsing exception for text='%s': %s", text, e
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[PARSE_DATETIME] Attempting to parse: text='%s', now='%s', tz='%s'",
+            text,
+            now.isoformat(),
+            tz_str,
         )
-        return None
+
+    key = text.strip().lower()
+    base = now.replace(second=0, microsecond=0)
+    dt = _parse_fast(key, base) or _parse_cached(key, base, tz_str)
 
     if not dt:
-        logger.warning(
-            "[PARSE_DATETIME] Date parsing returned None for text='%s'", text
-        )
+        # Routine for free-text replies; the caller decides what a miss means
+        logger.debug("[PARSE_DATETIME] Date parsing returned None for text='%s'", text)
         return None
 
     # Force timezone (dateparser sometimes returns local tz)
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=tz)
-        logger.info("[PARSE_DATETIME] Added timezone to naive datetime")
+        logger.debug("[PARSE_DATETIME] Added timezone to naive datetime")
 
-    logger.info(
-        "[PARSE_DATETIME] ✅ SUCCESS: '%s' -> '%s'",
-        text,
-        dt.isoformat(),
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "[PARSE_DATETIME] ✅ SUCCESS: '%s' -> '%s'",
+            text,
+            dt.isoformat(),
+        )
 
     return dt
@@ -8,11 +8,39 @@ Responsibilities:
 """
 
 import logging
+import time
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
 from app.config import settings
 
+# Record fields the format never shows; skips a thread / pid lookup per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the timestamp once per second.
+
+    datefmt has no sub-second fields, so every record in the same second
+    gets the same string; strftime only runs when the second changes.
+    """
+
+    def __init__(self, fmt: str, datefmt: str):
+        super().__init__(fmt=fmt, datefmt=datefmt)
+        # One tuple so concurrent handlers never see a torn (second, text) pair
+        self._cached_time = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+        second = int(record.created)
+        cached_second, text = self._cached_time
+        if second != cached_second:
+            text = time.strftime(self.datefmt, self.converter(second))
+            self._cached_time = (second, text)
+        return text
+
 
 def setup_logging() -> None:
     """
@@ -35,7 +63,7 @@ def setup_logging() -> None:
         return
 
     # Log format (human-readable + useful) ------------------------------------------------------------------
-    formatter = logging.Formatter(
+    formatter = _CachedTimeFormatter(
         fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
@@ -4,11 +4,11 @@ websocket.py
 FastAPI WebSocket handler for the Voice Assistant.
 
 Responsibilities:
-- Receive audio/text from client
+- Receive audio (binary frames, or legacy base64 JSON) / text from client
 - Perform STT if audio
-- Run LangGraph workflow
+- Run the conversation workflow
 - Convert system message to TTS
-- Send text + audio back to client
+- Send text back to client, then stream audio as binary PCM frames
 
 Error handling:
 - STT/TTS/Workflow errors are caught and returned to frontend without crashing
@@ -16,57 +16,136 @@ Error handling:
 
 
 import base64
-import json
+import hashlib
 import logging
-import urllib.request
 import asyncio
-from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect, Query
 
+from app.calendar.http_session import get_client
+from app.config import settings
+from app.sessions import SessionStore
 from app.state import ConversationState
 from app.workflow import run_step
+from app.graph import FIXED_REPLIES as NODE_FIXED_REPLIES, flush_pending_events
+from app.nlu.generator import FALLBACK_RESPONSE
+from app.calendar.google_calendar import GoogleCalendarError
 from app.stt.whisper import WhisperSTTService, STTError
-from app.tts.kokoro import KokoroTTSService, TTSError
+from app.tts.kokoro import KokoroTTSService, TTSError, PCM_FORMAT
 
 logger = logging.getLogger(__name__)
 
-# In-memory conversation store
-user_states: Dict[str, ConversationState] = {}
-_executor = ThreadPoolExecutor(max_workers=2)
+# In-memory conversation store; bounded so dropped connections can't leak.
+# Keyed by id(websocket), unique while the connection is open; a reused id
+# only ever belongs to a new connection, which overwrites the entry first.
+user_states: SessionStore[int, ConversationState] = SessionStore(
+    maxsize=settings.MAX_SESSIONS, ttl=settings.SESSION_TTL_SECONDS
+)
 
+ERROR_REPLY = "Sorry, something went wrong."
 
-def _fetch_google_user_info(access_token: str) -> Optional[dict]:
-    """Fetch user info from Google API."""
+# Every reply that never varies; their audio is rendered once at startup
+FIXED_REPLIES = (*NODE_FIXED_REPLIES, FALLBACK_RESPONSE, ERROR_REPLY)
+
+
+USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
+
+# Successful userinfo lookups, keyed by a digest of the token so raw tokens
+# aren't kept around; reconnects within the TTL skip the Google round trip.
+USERINFO_TTL_SECONDS = 300
+_user_info_cache: SessionStore[str, dict] = SessionStore(
+    maxsize=1024, ttl=USERINFO_TTL_SECONDS
+)
+
+
+async def _fetch_google_user_info(access_token: str) -> Optional[dict]:
+    """
+    Fetch user info from Google API.
+
+    Goes through the shared HTTP/2 client, so reconnects reuse the pooled
+    googleapis.com connection instead of a fresh TLS handshake per call.
+    """
     try:
-        logger.info(f"Validating token starting with: {access_token[:10]}...")
-        url = "https://www.googleapis.com/oauth2/v3/userinfo"
-        req = urllib.request.Request(
-            url,
+        logger.debug("Validating token starting with: %s...", access_token[:10])
+        resp = await get_client().get(
+            USERINFO_URL,
             headers={
                 "Authorization": f"Bearer {access_token}",
                 "User-Agent": "VoiceSchedulingAgent/1.0",
                 "Accept": "application/json",
             },
         )
-        with urllib.request.urlopen(req) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode()
-        logger.error(f"Google API Error {e.code}: {e.reason} - Body: {error_body}")
-        return None
+        if resp.status_code >= 400:
+            logger.error(
+                "Google API Error %s: %s - Body: %s",
+                resp.status_code,
+                resp.reason_phrase,
+                resp.text,
+            )
+            return None
+        return orjson.loads(resp.content)
     except Exception as e:
-        logger.error(f"Failed to fetch Google user info: {e}")
+        logger.error("Failed to fetch Google user info: %s", e)
         return None
 
 
+async def _get_user_info(access_token: str) -> Optional[dict]:
+    """Userinfo for the token, from cache when fetched recently."""
+    key = hashlib.blake2b(access_token.encode(), digest_size=16).hexdigest()
+    user_info = _user_info_cache.get(key)
+    if user_info is None:
+        user_info = await _fetch_google_user_info(access_token)
+        # Failures aren't cached; a refreshed token can retry right away
+        if user_info:
+            _user_info_cache[key] = user_info
+    return user_info
+
+
+async def _send_json(websocket: WebSocket, payload: dict) -> None:
+    """
+    Serialize with orjson and send as a text frame; binary frames are
+    reserved for PCM audio.
+    """
+    await websocket.send_text(orjson.dumps(payload).decode())
+
+
+async def _send_reply(websocket: WebSocket, state: ConversationState) -> None:
+    """
+    Send the reply text, then stream its audio as binary frames.
+
+    The JSON message carries the PCM format when audio follows; raw PCM16
+    chunks are sent as Kokoro produces them and an {"type": "audio_end"}
+    message closes the stream, even if synthesis fails part way.
+    """
+    text = state.system_message or ""
+    await _send_json(
+        websocket,
+        {
+            "text": text,
+            "audio": PCM_FORMAT if text else None,
+            "step": state.step,
+        }
+    )
+    if not text:
+        return
+
+    try:
+        async for pcm in KokoroTTSService.stream(text):
+            await websocket.send_bytes(pcm)
+    except TTSError as e:
+        logger.error("TTS generation failed: %s", e)
+
+    await _send_json(websocket, {"type": "audio_end"})
+
+
 async def websocket_endpoint(
     websocket: WebSocket, token: Optional[str] = Query(None)  # token from URL
 ):
     """Main WebSocket endpoint for voice interaction."""
     await websocket.accept()
-    user_id = str(id(websocket))
+    user_id = id(websocket)
     logger.info("WebSocket client connected: %s", user_id)
 
     # Initialize conversation state
@@ -81,14 +160,13 @@ async def websocket_endpoint(
     logger.info("Found token in connection params. Validating...")
 
     # Validate token by fetching user info
-    loop = asyncio.get_running_loop()
-    user_info = await loop.run_in_executor(_executor, _fetch_google_user_info, token)
+    user_info = await _get_user_info(token)
 
     if not user_info:
         logger.warning("Connection rejected: Invalid or expired token")
         # Notify frontend to clear invalid token
         try:
-            await websocket.send_json({"type": "auth_error"})
+            await _send_json(websocket, {"type": "auth_error"})
             # Small delay to ensure message is sent before close
             await asyncio.sleep(0.1)
         except Exception:
@@ -108,39 +186,24 @@ async def websocket_endpoint(
 
     # Run START node immediately to set the greeting before any user input
     try:
-        logger.info("[STARTUP] Running initial START turn for user %s", user_id)
+        logger.debug("[STARTUP] Running initial START turn for user %s", user_id)
         initial_state_dict = await run_step(state)
 
         if isinstance(initial_state_dict, dict):
-            state = ConversationState(**initial_state_dict)
+            state = ConversationState.model_construct(**initial_state_dict)
         else:
             state = initial_state_dict
 
         user_states[user_id] = state
-        logger.info(
+        logger.debug(
             "[STARTUP] Workflow started. Initial Step: %s, Message: %s",
             state.step,
             state.system_message,
         )
 
-        # Generate TTS for initial greeting
-        audio_b64: Optional[str] = None
-        if state.system_message:
-            try:
-                audio_b64 = await KokoroTTSService.synthesize(state.system_message)
-            except TTSError as e:
-                logger.error("[STARTUP] TTS failed for user %s: %s", user_id, e)
-                audio_b64 = None
-
-        # Send initial greeting to client
-        await websocket.send_json(
-            {
-                "text": state.system_message or "",
-                "audio_b64": audio_b64,
-                "step": state.step,
-            }
-        )
-        logger.info("[STARTUP] Initial greeting sent to user %s", user_id)
+        # Send initial greeting to client, audio streamed as it's synthesized
+        await _send_reply(websocket, state)
+        logger.debug("[STARTUP] Initial greeting sent to user %s", user_id)
 
     except (WebSocketDisconnect, RuntimeError):
         logger.info("Client disconnected during startup")
@@ -149,11 +212,12 @@ async def websocket_endpoint(
         logger.exception("Failed to send initial greeting")
 
         try:
-            state.system_message = "Sorry, something went wrong."
-            await websocket.send_json(
+            state.system_message = ERROR_REPLY
+            await _send_json(
+                websocket,
                 {
                     "text": state.system_message,
-                    "audio_b64": None,
+                    "audio": None,
                     "step": state.step,
                 }
             )
@@ -162,11 +226,18 @@ async def websocket_endpoint(
 
     try:
         while True:
-            message = await websocket.receive_text()
-            data = json.loads(message)
-
-            msg_type = data.get("type")
-            payload = data.get("payload")
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            if message.get("bytes") is not None:
+                # Binary frames are raw recorded audio; nothing to decode
+                msg_type = "audio"
+                payload = message["bytes"]
+            else:
+                data = orjson.loads(message["text"])
+                msg_type = data.get("type")
+                payload = data.get("payload")
             user_text: Optional[str] = None
 
             # Authentication --------------------------------
@@ -181,28 +252,37 @@ async def websocket_endpoint(
                     logger.info(
                         "Google access token received and stored for user %s", user_id
                     )
-                    await websocket.send_json({"status": "authenticated"})
+                    await _send_json(websocket, {"status": "authenticated"})
                 else:
                     logger.warning("Auth message received but no google_token found")
-                    await websocket.send_json({"error": "No token provided"})
+                    await _send_json(websocket, {"error": "No token provided"})
                 continue
 
             # STT --------------------------------
             if msg_type == "audio":
                 try:
-                    audio_bytes = base64.b64decode(payload)
+                    if isinstance(payload, str):
+                        # Legacy clients send base64 in JSON; decoding a large
+                        # clip inline would stall every other connection
+                        audio_bytes = await asyncio.to_thread(
+                            base64.b64decode, payload
+                        )
+                    else:
+                        audio_bytes = payload
                     user_text = await WhisperSTTService.transcribe(audio_bytes)
-                    logger.info("STT output: %s", user_text)
+                    logger.debug("STT output: %s", user_text)
                 except STTError as e:
                     logger.warning("STT failed: %s", e)
-                    await websocket.send_json(
-                        {"error": f"Audio transcription failed: {str(e)}"}
+                    await _send_json(
+                        websocket,
+                        {"error": f"Audio transcription failed: {str(e)}"},
                     )
                     continue
                 except Exception as e:
                     logger.exception("Unexpected error during STT")
-                    await websocket.send_json(
-                        {"error": "Unexpected server error during transcription"}
+                    await _send_json(
+                        websocket,
+                        {"error": "Unexpected server error during transcription"},
                     )
                     continue
 
@@ -210,56 +290,48 @@ async def websocket_endpoint(
                 user_text = payload
 
             else:
-                await websocket.send_json({"error": "Invalid message type"})
+                await _send_json(websocket, {"error": "Invalid message type"})
                 continue
 
-            # LangGraph Workflow --------------------------------
+            # Workflow --------------------------------
             state.last_user_message = user_text
-            logger.info("Current state.step before run_step: %s", state.step)
-            logger.info("Calling run_step with last_user_message: %s", user_text)
+            logger.debug("Current state.step before run_step: %s", state.step)
+            logger.debug("Calling run_step with last_user_message: %s", user_text)
             updated_state_dict: Optional[dict] = None
 
             try:
-                # Ensure we pass a plain dict to LangGraph
                 updated_state_dict = await run_step(state)
-                logger.info(
+                logger.debug(
                     "run_step completed. Result type: %s",
                     type(updated_state_dict),
                 )
                 if isinstance(updated_state_dict, dict):
-                    state = ConversationState(**updated_state_dict)
+                    # Built by our own nodes; re-validating every field is waste
+                    state = ConversationState.model_construct(**updated_state_dict)
                 else:
                     # Fallback if workflow returns a model
                     state = updated_state_dict
-                logger.info("New state.step after run_step: %s", state.step)
-                logger.info("New state.system_message: %s", state.system_message)
+                logger.debug("New state.step after run_step: %s", state.step)
+                logger.debug("New state.system_message: %s", state.system_message)
 
             except Exception:
-                logger.exception("LangGraph execution failed")
+                logger.exception("Workflow execution failed")
 
-                state.system_message = "Sorry, something went wrong."
+                state.system_message = ERROR_REPLY
 
             # Save updated state
             user_states[user_id] = state
 
-            # TTS -------------------------------
-            audio_b64: Optional[str] = None
-            if state.system_message:
-                try:
-                    audio_b64 = await KokoroTTSService.synthesize(state.system_message)
-                except TTSError as e:
-                    logger.error("TTS generation failed: %s", e)
-                    audio_b64 = None
-
-            # Response --------------------------------
-            await websocket.send_json(
-                {
-                    "text": state.system_message or "",
-                    "audio_b64": audio_b64,
-                    "step": state.step,
-                }
-            )
+            # Response + TTS --------------------------------
+            await _send_reply(websocket, state)
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected: %s", user_id)
+    finally:
+        # Any exit, not just a clean disconnect, must insert confirmed events
+        # still queued for the batch before the session is released
+        try:
+            await flush_pending_events(state)
+        except GoogleCalendarError:
+            logger.exception("Failed to flush pending events for %s", user_id)
         user_states.pop(user_id, None)
@@ -1,7 +1,6 @@
 # workflow.py
 
 import logging
-from langgraph.graph import StateGraph, END
 
 from app.graph import (
     start_node,
@@ -16,17 +15,11 @@ from app.state import ConversationState
 
 logger = logging.getLogger(__name__)
 
-
-# Router ---------------------------------------------------------------------------
+# Chat messages kept for the generator prompt (user + assistant per turn)
+CHAT_HISTORY_LIMIT = 8
 
 
-def next_step_router(state: ConversationState) -> str:
-    """
-    Determines the NEXT node to execute.
-    This router is executed AFTER a node runs.
-    """
-    logger.info("[NEXT_STEP_ROUTER] Called with state.step: %s", state.step)
-    return state.step
+# Router ---------------------------------------------------------------------------
 
 
 def route_start(state: ConversationState) -> str:
@@ -34,7 +27,7 @@ def route_start(state: ConversationState) -> str:
     Determines the entry point based on the current step.
     This allows the graph to resume from the correct state.
     """
-    logger.info("[ROUTE_START] Called with state.step: %s", state.step)
+    logger.debug("[ROUTE_START] Called with state.step: %s", state.step)
     if state.step and state.step in {
         "ASK_NAME",
         "ASK_DATETIME",
@@ -43,84 +36,75 @@ def route_start(state: ConversationState) -> str:
         "AWAIT_CONFIRMATION",
         "HANDLE_NEW_LOOP",
     }:
-        logger.info("[ROUTE_START] Routing directly to existing step: %s", state.step)
+        logger.debug("[ROUTE_START] Routing directly to existing step: %s", state.step)
         return state.step
-    logger.info("[ROUTE_START] No valid step found. Routing to: START")
+    logger.debug("[ROUTE_START] No valid step found. Routing to: START")
     return "START"
 
 
-# Graph Builder ---------------------------------------------------------------------------
-
-
-def build_graph() -> StateGraph:
-    graph = StateGraph(ConversationState)
-
-    # Nodes
-    graph.add_node("START", start_node)
-    graph.add_node("ASK_NAME", ask_name_node)
-    graph.add_node("ASK_DATETIME", ask_datetime_node)
-    graph.add_node("ASK_TITLE", ask_title_node)
-    graph.add_node("CONFIRM_DETAILS", confirm_details_node)
-    graph.add_node("AWAIT_CONFIRMATION", await_confirmation_node)
-    graph.add_node("HANDLE_NEW_LOOP", handle_new_loop_node)
-
-    # Dynamic Entry Point
-    graph.set_conditional_entry_point(
-        route_start,
-        {
-            "START": "START",
-            "ASK_NAME": "ASK_NAME",
-            "ASK_DATETIME": "ASK_DATETIME",
-            "ASK_TITLE": "ASK_TITLE",
-            "CONFIRM_DETAILS": "CONFIRM_DETAILS",
-            "AWAIT_CONFIRMATION": "AWAIT_CONFIRMATION",
-            "HANDLE_NEW_LOOP": "HANDLE_NEW_LOOP",
-        },
-    )
-
-    graph.add_edge("START", END)
-    graph.add_edge("ASK_NAME", END)
-    graph.add_edge("ASK_DATETIME", END)
-
-    graph.add_conditional_edges(
-        "ASK_TITLE",
-        next_step_router,
-        {
-            "CONFIRM_DETAILS": "CONFIRM_DETAILS",
-            "ASK_TITLE": END,
-        },
-    )
-
-    graph.add_edge("CONFIRM_DETAILS", END)
-    graph.add_edge("AWAIT_CONFIRMATION", END)
-    graph.add_edge("HANDLE_NEW_LOOP", END)
+# Direct Dispatch ---------------------------------------------------------------------------
 
-    return graph.compile()
+# The conversation graph: one node per turn, entered at state.step, except
+# an ASK_TITLE that completes the slots runs CONFIRM_DETAILS straight after.
+NODE_MAPPING = {
+    "START": start_node,
+    "ASK_NAME": ask_name_node,
+    "ASK_DATETIME": ask_datetime_node,
+    "ASK_TITLE": ask_title_node,
+    "CONFIRM_DETAILS": confirm_details_node,
+    "AWAIT_CONFIRMATION": await_confirmation_node,
+    "HANDLE_NEW_LOOP": handle_new_loop_node,
+}
+CHAINED_STEPS = {"ASK_TITLE": "CONFIRM_DETAILS"}
 
 
-# Compiled Graph ---------------------------------------------------------------------------
+# Public Runner ---------------------------------------------------------------------------
 
-conversation_graph = build_graph()
 
+def _append_turn(history: list, user_message, system_message) -> list:
+    """Record this turn once, after whichever nodes ran, and trim the tail."""
+    turn = []
+    if user_message:
+        turn.append({"role": "user", "content": user_message})
+    if system_message:
+        turn.append({"role": "assistant", "content": system_message})
+    return [*history, *turn][-CHAT_HISTORY_LIMIT:]
 
-# Public Runner ---------------------------------------------------------------------------
 
 async def run_step(state: ConversationState) -> dict:
     """
     Executes exactly ONE node per websocket turn.
+
+    Nodes are awaited directly: routing is a dict lookup, and each node's
+    partial update is merged over the current values. Every node gets a
+    fresh copy of the values, so the caller's state is left untouched if a
+    node fails part way.
+
+    The values are a shallow field dict: nodes only ever replace the list
+    fields (chat_history, pending_events), never mutate them, so the deep
+    copy state.dict() made of the history every turn bought nothing.
     """
-    logger.info("Starting with state.step: %s", state.step)
-    logger.info("state.last_user_message: %s", state.last_user_message)
+    logger.debug("Starting with state.step: %s", state.step)
+    logger.debug("state.last_user_message: %s", state.last_user_message)
     try:
-        result = await conversation_graph.ainvoke(
-            state.dict(),
-            config={"recursion_limit": 3},
-        )
-        logger.info(
+        result = dict(state)
+        node_name = route_start(state)
+        while True:
+            node = NODE_MAPPING[node_name]
+            result.update(await node(ConversationState.model_construct(**result)))
+            if result.get("step") != CHAINED_STEPS.get(node_name):
+                break
+            node_name = result["step"]
+        logger.debug(
             "[RUN_STEP] Edge traversal complete. Output Step: %s", result.get("step")
         )
+        result["chat_history"] = _append_turn(
+            result.get("chat_history") or [],
+            state.last_user_message,
+            result.get("system_message"),
+        )
         return result
 
     except Exception:
         logger.exception("Graph execution failed")
-        return state.dict()
+        return dict(state)
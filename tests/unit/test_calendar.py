@@ -0,0 +1,183 @@
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.calendar.google_calendar import (
+    GoogleCalendarError,
+    GoogleCalendarPartialError,
+    GoogleCalendarService,
+)
+
+START = datetime.now(timezone.utc) + timedelta(days=1)
+EVENT = {"event_id": "abc", "html_link": "https://example", "status": "confirmed"}
+
+
+@pytest.mark.asyncio
+async def test_create_event_retries_transient_status(mocker):
+    calendar = GoogleCalendarService()
+    sleep = mocker.patch("app.calendar.google_calendar.asyncio.sleep")
+    mocker.patch.object(
+        calendar,
+        "_insert_event",
+        side_effect=[GoogleCalendarError("busy", status=503), EVENT],
+    )
+    result = await calendar.create_event(title="Sync", start_datetime=START)
+    assert result == EVENT
+    sleep.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_event_fails_fast_on_client_error(mocker):
+    calendar = GoogleCalendarService()
+    insert = mocker.patch.object(
+        calendar,
+        "_insert_event",
+        side_effect=GoogleCalendarError("bad request", status=400),
+    )
+    with pytest.raises(GoogleCalendarError):
+        await calendar.create_event(title="Sync", start_datetime=START, retries=3)
+    assert insert.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_create_event_gives_up_after_retries(mocker):
+    calendar = GoogleCalendarService()
+    mocker.patch("app.calendar.google_calendar.asyncio.sleep")
+    mocker.patch.object(calendar, "_insert_event", side_effect=ConnectionError("down"))
+    with pytest.raises(GoogleCalendarError):
+        await calendar.create_event(title="Sync", start_datetime=START)
+
+
+@pytest.mark.asyncio
+async def test_create_event_rejects_past_start(mocker):
+    calendar = GoogleCalendarService()
+    insert = mocker.patch.object(calendar, "_insert_event", return_value=EVENT)
+    with pytest.raises(GoogleCalendarError):
+        await calendar.create_event(
+            title="Sync", start_datetime=datetime.now(timezone.utc) - timedelta(hours=1)
+        )
+    insert.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_create_events_retries_transient_parts(mocker):
+    calendar = GoogleCalendarService()
+    mocker.patch.object(calendar, "_get_token", return_value="token")
+    mocker.patch.object(
+        calendar,
+        "_post_batch",
+        return_value=[(200, {"id": "a"}), (503, {})],
+    )
+    create = mocker.patch.object(calendar, "create_event", return_value=EVENT)
+    events = [
+        {"title": "One", "start_datetime": START},
+        {"title": "Two", "start_datetime": START},
+    ]
+    results = await calendar.batch_create_events(events)
+    assert [r["event_id"] for r in results] == ["a", "abc"]
+    create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_create_events_skips_invalid_event(mocker):
+    calendar = GoogleCalendarService()
+    mocker.patch.object(calendar, "_get_token", return_value="token")
+    post = mocker.patch.object(
+        calendar,
+        "_post_batch",
+        return_value=[(200, {"id": "a"}), (200, {"id": "b"})],
+    )
+    events = [
+        {"title": "One", "start_datetime": START},
+        {"title": "Past", "start_datetime": START - timedelta(days=2)},
+        {"title": "Two", "start_datetime": START},
+    ]
+    with pytest.raises(GoogleCalendarError):
+        await calendar.batch_create_events(events)
+    sent = post.await_args.args[0]
+    assert [e["title"] for e in sent] == ["One", "Two"]
+
+
+@pytest.mark.asyncio
+async def test_post_batch_parses_multipart_response(mocker):
+    calendar = GoogleCalendarService()
+    body = (
+        "--batch_xyz\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: <response-item1>\r\n\r\n"
+        "HTTP/1.1 409 Conflict\r\n"
+        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        '{"error": {"code": 409, "message": "duplicate"}}\r\n'
+        "--batch_xyz\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: <response-item0>\r\n\r\n"
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        '{"id": "a", "htmlLink": "https://example/a", "status": "confirmed"}\r\n'
+        "--batch_xyz--\r\n"
+    )
+    response = httpx.Response(
+        200,
+        headers={"content-type": "multipart/mixed; boundary=batch_xyz"},
+        text=body,
+    )
+    client = mocker.Mock()
+    client.post = mocker.AsyncMock(return_value=response)
+    mocker.patch("app.calendar.google_calendar.get_client", return_value=client)
+
+    chunk = [
+        {"title": "One", "start_datetime": START},
+        {"title": "Two", "start_datetime": START},
+        {"title": "Three", "start_datetime": START},
+    ]
+    outcomes = await calendar._post_batch(chunk, "UTC", "token")
+
+    assert outcomes[0] == (
+        200,
+        {"id": "a", "htmlLink": "https://example/a", "status": "confirmed"},
+    )
+    assert outcomes[1][0] == 409
+    # Missing parts are reported as retryable
+    assert outcomes[2] == (503, {})
+
+
+@pytest.mark.asyncio
+async def test_batch_create_events_reports_partial_failure(mocker):
+    calendar = GoogleCalendarService()
+    mocker.patch.object(calendar, "_get_token", return_value="token")
+    mocker.patch.object(
+        calendar,
+        "_post_batch",
+        return_value=[(200, {"id": "a"}), (400, {})],
+    )
+    events = [
+        {"title": "One", "start_datetime": START},
+        {"title": "Two", "start_datetime": START},
+    ]
+    with pytest.raises(GoogleCalendarPartialError) as excinfo:
+        await calendar.batch_create_events(events)
+    assert [r["event_id"] for r in excinfo.value.created] == ["a"]
+    assert excinfo.value.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_create_events_resend_is_idempotent(mocker):
+    calendar = GoogleCalendarService()
+    mocker.patch("app.calendar.google_calendar.asyncio.sleep")
+    mocker.patch.object(calendar, "_get_token", return_value="token")
+    # First send times out after Google inserted both; the resend conflicts
+    post = mocker.patch.object(
+        calendar,
+        "_post_batch",
+        side_effect=[httpx.ReadTimeout("slow"), [(409, {}), (409, {})]],
+    )
+    events = [
+        {"title": "One", "start_datetime": START},
+        {"title": "Two", "start_datetime": START},
+    ]
+    results = await calendar.batch_create_events(events)
+
+    sent = [call.args[0] for call in post.await_args_list]
+    ids = [e["event_id"] for e in sent[0]]
+    assert [e["event_id"] for e in sent[1]] == ids
+    assert [r["event_id"] for r in results] == ids
@@ -0,0 +1,49 @@
+import pytest
+from datetime import datetime, timezone
+
+from app.utils import datetime_parser
+from app.utils.datetime_parser import parse_datetime
+
+NOW = datetime(2025, 1, 10, 9, 15, 42, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("in 2 hours", datetime(2025, 1, 10, 11, 15, tzinfo=timezone.utc)),
+        ("in an hour", datetime(2025, 1, 10, 10, 15, tzinfo=timezone.utc)),
+        ("In 30 mins.", datetime(2025, 1, 10, 9, 45, tzinfo=timezone.utc)),
+        ("tomorrow at 5pm", datetime(2025, 1, 11, 17, 0, tzinfo=timezone.utc)),
+        ("today 10:30 a.m.", datetime(2025, 1, 10, 10, 30, tzinfo=timezone.utc)),
+        ("tomorrow at 12am", datetime(2025, 1, 11, 0, 0, tzinfo=timezone.utc)),
+        ("tomorrow 17:45", datetime(2025, 1, 11, 17, 45, tzinfo=timezone.utc)),
+    ],
+)
+def test_parse_datetime_fast_path(mocker, text, expected):
+    slow = mocker.patch.object(datetime_parser, "_parse_cached")
+    assert parse_datetime(text, now=NOW) == expected
+    slow.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "text", ["next monday", "tomorrow 5", "tomorrow at 13pm", "jan 10 evening"]
+)
+def test_parse_datetime_falls_back_to_dateparser(mocker, text):
+    slow = mocker.patch.object(datetime_parser, "_parse_cached", return_value=None)
+    assert parse_datetime(text, now=NOW) is None
+    slow.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Tomorrow at 5pm.", datetime(2025, 1, 11, 17, 0, tzinfo=timezone.utc)),
+        ("next monday", None),
+        ("Let's do the design review", None),
+        (None, None),
+    ],
+)
+def test_parse_datetime_fast_never_calls_dateparser(mocker, text, expected):
+    slow = mocker.patch.object(datetime_parser, "_parse_cached")
+    assert datetime_parser.parse_datetime_fast(text, now=NOW) == expected
+    slow.assert_not_called()
@@ -0,0 +1,30 @@
+import pytest
+
+from app.nlu.extractor import _normalize_message
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("Um, well, tomorrow at 3.", "tomorrow at 3"),
+        ("Okay, tmrw at 3pm", "tomorrow at 3pm"),
+        ("Yes!", "yes"),
+    ],
+)
+def test_normalize_message_collapses_filler_variants(first, second):
+    assert _normalize_message(first).lower() == _normalize_message(second).lower()
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("Well Being session", "being session"),
+        ("Mary-Jane", "Mary Jane"),
+        ("So Long Review", "Long Review"),
+        ("Please Review", "Review"),
+        ("at 3.30", "at 3 30"),
+        ("sarah", "Sarah"),
+    ],
+)
+def test_normalize_message_keeps_slot_values_apart(first, second):
+    assert _normalize_message(first) != _normalize_message(second)
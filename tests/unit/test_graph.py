@@ -0,0 +1,74 @@
+import pytest
+from collections import OrderedDict
+
+from app import graph
+from app.calendar.google_calendar import GoogleCalendarPartialError
+from app.nlu.generator import FALLBACK_RESPONSE
+from app.state import ConversationState
+
+
+@pytest.mark.asyncio
+async def test_start_node_reuses_greeting_for_fresh_sessions(mocker):
+    mocker.patch.object(graph, "_greeting_cache", OrderedDict())
+    generate = mocker.patch.object(graph, "generate_response", return_value="Hi Sam!")
+
+    first = await graph.start_node(ConversationState(name="Sam"))
+    second = await graph.start_node(ConversationState(name="Sam"))
+
+    assert first == second == {"system_message": "Hi Sam!", "step": "ASK_DATETIME"}
+    generate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_start_node_skips_cache_mid_session_and_on_failure(mocker):
+    mocker.patch.object(graph, "_greeting_cache", OrderedDict())
+    generate = mocker.patch.object(
+        graph, "generate_response", return_value=FALLBACK_RESPONSE
+    )
+    history = [{"role": "assistant", "content": "Bye."}]
+
+    await graph.start_node(ConversationState())
+    await graph.start_node(ConversationState())
+    await graph.start_node(ConversationState(chat_history=history))
+
+    assert generate.await_count == 3
+    assert not graph._greeting_cache
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("My name is Sarah Lee.", "Sarah Lee"),
+        ("my name is Good", "Good"),
+        ("I'm Sam", "Sam"),
+        ("I am Jane Doe.", "Jane Doe"),
+        ("Sarah", None),
+        ("Nope.", None),
+        ("Hello.", None),
+        ("Never Mind.", None),
+        ("It's Me.", None),
+        ("I'm Busy.", None),
+        ("I'm Not", None),
+        ("I'm Good.", None),
+    ],
+)
+def test_fast_name(message, expected):
+    assert graph._fast_name(message) == expected
+
+
+@pytest.mark.asyncio
+async def test_handle_new_loop_reports_partial_calendar_failure(mocker):
+    mocker.patch.object(
+        graph,
+        "flush_pending_events",
+        side_effect=GoogleCalendarPartialError(
+            "1 of 2 failed", [{"event_id": "a"}], 1
+        ),
+    )
+    generate = mocker.patch.object(graph, "generate_response", return_value="Bye!")
+    state = ConversationState(step="HANDLE_NEW_LOOP", last_user_message="No")
+
+    result = await graph.handle_new_loop_node(state)
+
+    assert result["system_message"] == "Bye!"
+    assert "1 of their meetings" in generate.await_args.kwargs["goal"]
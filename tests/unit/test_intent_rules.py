@@ -0,0 +1,37 @@
+import pytest
+
+from app.nlu.intent_rules import classify_confirmation
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["yes", "Yeah, go ahead.", "sure thing", "OK", "that's correct", "Y"],
+)
+def test_classify_confirmation_yes(message):
+    assert classify_confirmation(message) == "yes"
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["no", "Nope.", "cancel it", "don't", "never mind", "nah", "not today", "Wrong."],
+)
+def test_classify_confirmation_no(message):
+    assert classify_confirmation(message) == "no"
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "",
+        None,
+        "hmm, let me think",
+        "yes, no wait",
+        "I'm not sure",
+        "not sure",
+        "That's not correct",
+        "Sure, but not now",
+        "ok, that isn't right",
+    ],
+)
+def test_classify_confirmation_ambiguous(message):
+    assert classify_confirmation(message) is None
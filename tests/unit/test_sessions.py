@@ -0,0 +1,29 @@
+from app.sessions import SessionStore
+
+
+def test_session_store_evicts_least_recently_written():
+    store = SessionStore(maxsize=2, ttl=60)
+    store["a"] = 1
+    store["b"] = 2
+    store["a"] = 3
+    store["c"] = 4
+    assert store.get("b") is None
+    assert store.get("a") == 3
+    assert len(store) == 2
+
+
+def test_session_store_expires_idle_entries(mocker):
+    clock = mocker.patch("app.sessions.time.monotonic", return_value=0.0)
+    store = SessionStore(maxsize=10, ttl=60)
+    store["a"] = 1
+    clock.return_value = 61.0
+    assert store.get("a") is None
+    store["b"] = 2
+    assert len(store) == 1
+
+
+def test_session_store_pop():
+    store = SessionStore(maxsize=2, ttl=60)
+    store["a"] = 1
+    assert store.pop("a") == 1
+    assert store.pop("a") is None
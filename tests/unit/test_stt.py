@@ -1,3 +1,6 @@
+import shutil
+import subprocess
+
 import pytest
 from app.stt.whisper import WhisperSTTService, STTError
 
@@ -21,3 +24,19 @@ async def test_transcribe_internal_error(mocker):
     mocker.patch.object(stt, "_sync_transcribe", side_effect=Exception("oops"))
     with pytest.raises(STTError):
         await stt.transcribe(b"\x00" * 32000)
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_decode_audio_non_streamable_mp4(tmp_path):
+    # The mp4 muxer writes the moov atom last unless asked for +faststart,
+    # so the decoder has to seek back through piped input
+    path = tmp_path / "clip.m4a"
+    subprocess.run(
+        [
+            "ffmpeg", "-loglevel", "error",
+            "-f", "lavfi", "-i", "sine=frequency=440:duration=1",
+            "-c:a", "aac", str(path),
+        ],
+        check=True,
+    )
+    samples = WhisperSTTService._decode_audio(path.read_bytes())
+    assert abs(len(samples) - 16000) < 1600
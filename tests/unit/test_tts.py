@@ -1,22 +1,60 @@
 import pytest
+from collections import OrderedDict
 from app.tts.kokoro import KokoroTTSService, TTSError
 
+def iter_raising(exc):
+    raise exc
+    yield
+
+@pytest.mark.asyncio
+async def test_tts_stream_empty_text(mocker):
+    iter_pcm = mocker.patch.object(KokoroTTSService, "_iter_pcm_blocking")
+    chunks = [pcm async for pcm in KokoroTTSService.stream("  ")]
+    assert chunks == []
+    iter_pcm.assert_not_called()
+
 @pytest.mark.asyncio
-async def test_tts_success(mocker):
-    tts = KokoroTTSService()
-    mocker.patch.object(tts, "_synthesize_blocking", return_value=b"dummybytes")
-    out = await tts.synthesize("Hello world")
-    assert out != ""
+async def test_tts_stream_error_wrapping(mocker):
+    mocker.patch.object(KokoroTTSService, "_recent_pcm", OrderedDict())
+    mocker.patch.object(
+        KokoroTTSService,
+        "_iter_pcm_blocking",
+        return_value=iter_raising(Exception("kokoro died")),
+    )
+    with pytest.raises(TTSError):
+        [pcm async for pcm in KokoroTTSService.stream("Hello")]
 
 @pytest.mark.asyncio
-async def test_tts_empty_text():
-    tts = KokoroTTSService()
-    result = await tts.synthesize("")
-    assert result == ""
+async def test_tts_stream_yields_chunks(mocker):
+    mocker.patch.object(KokoroTTSService, "_recent_pcm", OrderedDict())
+    mocker.patch.object(
+        KokoroTTSService, "_iter_pcm_blocking", return_value=iter([b"ab", b"cd"])
+    )
+    chunks = [pcm async for pcm in KokoroTTSService.stream("Hello")]
+    assert chunks == [b"ab", b"cd"]
 
 @pytest.mark.asyncio
-async def test_tts_error_wrapping(mocker):
-    tts = KokoroTTSService()
-    mocker.patch.object(tts, "_synthesize_blocking", side_effect=Exception("kokoro died"))
+async def test_tts_stream_empty_audio(mocker):
+    mocker.patch.object(KokoroTTSService, "_recent_pcm", OrderedDict())
+    mocker.patch.object(KokoroTTSService, "_iter_pcm_blocking", return_value=iter([]))
     with pytest.raises(TTSError):
-        await tts.synthesize("Hello")
+        [pcm async for pcm in KokoroTTSService.stream("Hello")]
+
+@pytest.mark.asyncio
+async def test_tts_stream_serves_prerendered(mocker):
+    mocker.patch.dict(KokoroTTSService._pcm_cache, {"Bye.": [b"ab"]})
+    iter_pcm = mocker.patch.object(KokoroTTSService, "_iter_pcm_blocking")
+    chunks = [pcm async for pcm in KokoroTTSService.stream("Bye.")]
+    assert chunks == [b"ab"]
+    iter_pcm.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_tts_stream_reuses_recent_render(mocker):
+    mocker.patch.object(KokoroTTSService, "_recent_pcm", OrderedDict())
+    iter_pcm = mocker.patch.object(
+        KokoroTTSService, "_iter_pcm_blocking", return_value=iter([b"ab"])
+    )
+    first = [pcm async for pcm in KokoroTTSService.stream("Hi Sam.")]
+    second = [pcm async for pcm in KokoroTTSService.stream("Hi Sam.")]
+    assert first == second == [b"ab"]
+    iter_pcm.assert_called_once()
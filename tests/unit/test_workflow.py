@@ -0,0 +1,40 @@
+import pytest
+
+from app import workflow
+from app.state import ConversationState
+
+
+@pytest.mark.asyncio
+async def test_run_step_chains_confirm_after_title(mocker):
+    async def ask_title(state):
+        return {"meeting_title": "Sync", "step": "CONFIRM_DETAILS"}
+
+    async def confirm_details(state):
+        assert state.meeting_title == "Sync"
+        return {"system_message": "Confirm?", "step": "AWAIT_CONFIRMATION"}
+
+    mocker.patch.dict(
+        workflow.NODE_MAPPING,
+        {"ASK_TITLE": ask_title, "CONFIRM_DETAILS": confirm_details},
+    )
+    state = ConversationState(step="ASK_TITLE", last_user_message="Sync")
+    result = await workflow.run_step(state)
+
+    assert result["step"] == "AWAIT_CONFIRMATION"
+    assert result["system_message"] == "Confirm?"
+    assert result["chat_history"][-1] == {"role": "assistant", "content": "Confirm?"}
+    assert state.step == "ASK_TITLE"
+
+
+@pytest.mark.asyncio
+async def test_run_step_keeps_state_on_node_failure(mocker):
+    async def ask_name(state):
+        state.name = "Half"
+        raise RuntimeError("llm down")
+
+    mocker.patch.dict(workflow.NODE_MAPPING, {"ASK_NAME": ask_name})
+    state = ConversationState(step="ASK_NAME")
+    result = await workflow.run_step(state)
+
+    assert result["name"] is None
+    assert result["step"] == "ASK_NAME"